@@ -1,35 +1,678 @@
 import os
+import sys
+import re
 import logging
 import pandas as pd
 import numpy as np
-import plotly.graph_objs as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import plotly.io as pio
-from flask import Flask, request, Response, session
+from plotly.offline import get_plotlyjs
+from plotly.offline.offline import get_plotlyjs_version
+from flask import Flask, request, Response, session, abort, stream_with_context, g, has_app_context, copy_current_request_context
 from datetime import datetime
-import random
 import json
+import gzip
+import hashlib
+import threading
+import fcntl
+import shutil
+import time
+import zlib
+import uuid
+import base64
+import functools
+import bisect
+import hmac
+import io
+import tempfile
+import random
+import queue
+import atexit
+import logging.handlers
+import cProfile
+import pstats
+from html import escape as html_escape
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
 
 # Configure Plotly for offline rendering
 pio.templates.default = "plotly_dark"
 
-# Set up logging to stdout for Render
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()]
-)
+# Copy-on-Write lets every request share the frozen dataset frames without defensive copies
+pd.set_option('mode.copy_on_write', True)
+
+# Logging to stdout for Render: one JSON object per line (LOG_FORMAT=text for the plain format). Records go
+# through a bounded queue to a listener thread that formats and writes them, so a request never waits on
+# stdout; when the queue is full records are dropped and counted instead of blocking.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+# Share of successful requests that get an access record; errors and slow requests are always logged
+LOG_REQUEST_SAMPLE = float(os.environ.get('LOG_REQUEST_SAMPLE', 1.0))
+LOG_SLOW_SECONDS = float(os.environ.get('LOG_SLOW_SECONDS', 1.0))
+
+class StructuredFormatter(logging.Formatter):
+    # Formats a record with the structured fields passed as extra={"fields": {...}}, as JSON or as plain text
+    def __init__(self, json_lines=True):
+        super().__init__("%(asctime)s - %(levelname)s - %(message)s")
+        self.json_lines = json_lines
+
+    def format(self, record):
+        fields = getattr(record, 'fields', None)
+        if not self.json_lines:
+            text = super().format(record)
+            return f"{text} {json.dumps(fields, default=str)}" if fields else text
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    # Queues records as they are: message formatting happens on the listener thread, not the caller's
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+log_queue = queue.Queue(LOG_QUEUE_SIZE)
+log_handler = DeferredQueueHandler(log_queue)
+log_output = logging.StreamHandler(sys.stdout)
+log_output.setFormatter(StructuredFormatter(json_lines=LOG_FORMAT != 'text'))
+logging.basicConfig(level=LOG_LEVEL, handlers=[log_handler], force=True)
+# The dev server's access lines duplicate the request records below
+logging.getLogger('werkzeug').setLevel(logging.WARNING)
+request_log = logging.getLogger('dashboard.request')
+log_listener = None
+
+# Helper function to (re)start the thread that drains the log queue; a forked worker needs its own
+def start_log_listener():
+    global log_listener
+    log_listener = logging.handlers.QueueListener(log_queue, log_output)
+    log_listener.start()
+
+start_log_listener()
+os.register_at_fork(after_in_child=start_log_listener)
+atexit.register(lambda: log_listener.stop())
 
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY') or 'a secret key'
 
+# Dimensions and additive measures of the precomputed sales aggregate cube
+CUBE_DIMENSIONS = ['salesperson', 'car_make', 'car_model', 'car_year', 'month']
+CUBE_MEASURES = ['sale_price', 'commission_earned', 'sale_price_count', 'commission_earned_count', 'transactions']
+
+# Dimensions that can be filtered from the form, the session or the query string
+FILTER_DIMENSIONS = ['salesperson', 'car_make', 'car_model', 'car_year']
+
+class FilterIndex:
+    # Categorical codes per filter dimension plus a sorted row-id array per distinct value,
+    # so a filter selection is a union/intersection of small integer arrays instead of a row scan.
+    # Codes are the table's own categorical codes when its categories are sorted (no copy), otherwise the
+    # narrowest integer type that holds them; row ids are int32 while the table fits.
+    def __init__(self, df, dimensions=FILTER_DIMENSIONS):
+        self.size = len(df)
+        self.codes = {}
+        self.uniques = {}
+        self.postings = {}
+        for dim in dimensions:
+            if dim not in df:
+                continue
+            values = df[dim]
+            if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.is_monotonic_increasing:
+                codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+            else:
+                codes, uniques = pd.factorize(values, sort=True)
+                codes = codes.astype(narrowest_code_dtype(uniques))
+            self.codes[dim] = codes
+            self.uniques[dim] = np.asarray(uniques)
+            self.postings[dim] = self.group_rows(codes, self.uniques[dim], row_dtype=self.row_dtype(self.size))
+
+    @staticmethod
+    def row_dtype(size):
+        return np.int32 if size < 2**31 else np.intp
+
+    @staticmethod
+    def group_rows(codes, uniques, offset=0, row_dtype=np.intp):
+        # Maps str(value) -> sorted row ids (shifted by offset) for every value that occurs in codes
+        order = np.argsort(codes, kind='stable').astype(row_dtype)
+        sorted_codes = codes[order]
+        starts = np.searchsorted(sorted_codes, np.arange(len(uniques)), side='left')
+        ends = np.searchsorted(sorted_codes, np.arange(len(uniques)), side='right')
+        return {str(value): order[start:end] + row_dtype(offset) for value, start, end in zip(uniques, starts, ends) if end > start}
+
+    def extended(self, batch):
+        # Returns a new index covering the rows of batch appended after the indexed ones; only the batch is
+        # factorized, and existing codes are remapped only when the batch brings values not seen before.
+        # The current index is left untouched for requests still using it.
+        index = FilterIndex.__new__(FilterIndex)
+        index.size = self.size + len(batch)
+        index.codes, index.uniques, index.postings = {}, {}, {}
+        row_dtype = self.row_dtype(index.size)
+        for dim, codes in self.codes.items():
+            batch_codes, batch_uniques = pd.factorize(batch[dim], sort=True)
+            batch_uniques = np.asarray(batch_uniques)
+            uniques = self.uniques[dim]
+            if len(np.setdiff1d(batch_uniques, uniques)):
+                merged = np.union1d(uniques, batch_uniques)
+                remap = np.searchsorted(merged, uniques).astype(narrowest_code_dtype(merged))
+                codes = np.where(codes >= 0, remap[np.maximum(codes, 0)], -1).astype(remap.dtype)
+                uniques = merged
+            code_dtype = narrowest_code_dtype(uniques)
+            batch_remap = np.searchsorted(uniques, batch_uniques).astype(code_dtype)
+            batch_codes = np.where(batch_codes >= 0, batch_remap[np.maximum(batch_codes, 0)], -1).astype(code_dtype)
+            index.codes[dim] = np.concatenate([codes.astype(code_dtype, copy=False), batch_codes])
+            index.uniques[dim] = uniques
+            added = self.group_rows(batch_codes, uniques, offset=self.size, row_dtype=row_dtype)
+            postings = self.postings[dim]
+            index.postings[dim] = {
+                key: np.concatenate([postings[key], added[key]]).astype(row_dtype, copy=False) if key in postings and key in added
+                else postings.get(key, added.get(key)).astype(row_dtype, copy=False)
+                for key in (str(value) for value in uniques) if key in postings or key in added
+            }
+        return index
+
+    def rows_for(self, dim, values):
+        postings = self.postings.get(dim, {})
+        arrays = [postings[value] for value in values if value in postings]
+        if not arrays:
+            return np.empty(0, dtype=self.row_dtype(self.size))
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.unique(np.concatenate(arrays))
+
+    def select(self, filters):
+        # Returns sorted row positions matching every filtered dimension, or None when nothing is filtered
+        selections = [self.rows_for(dim, values) for dim, values in filters.items() if values]
+        if not selections:
+            return None
+        selections.sort(key=len)
+        rows = selections[0]
+        for other in selections[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+# Helper function to serialize JSON for an inline <script>: <, > and & are escaped so data values cannot close the tag
+def html_safe_json(value):
+    return json.dumps(value).replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+
+class DimensionDictionary:
+    # Distinct values, row counts and the make -> model hierarchy of the sales table, read off its FilterIndex
+    # once per dataset version, with the <option> markup of every value prebuilt for the filter form
+    def __init__(self, index, version):
+        self.values = {dim: list(postings) for dim, postings in index.postings.items()}
+        self.counts = {dim: [len(rows) for rows in postings.values()] for dim, postings in index.postings.items()}
+        self.models_by_make = {}
+        if 'car_make' in index.codes and 'car_model' in index.codes:
+            makes, models = [str(value) for value in index.uniques['car_make']], [str(value) for value in index.uniques['car_model']]
+            make_codes, model_codes = index.codes['car_make'], index.codes['car_model']
+            valid = (make_codes >= 0) & (model_codes >= 0)
+            pairs = np.unique(make_codes[valid].astype(np.int64) * len(models) + model_codes[valid])
+            for pair in pairs.tolist():
+                self.models_by_make.setdefault(makes[pair // len(models)], []).append(models[pair % len(models)])
+        self.models_json = html_safe_json(self.models_by_make)
+        self.positions = {dim: {value: i + 1 for i, value in enumerate(values)} for dim, values in self.values.items()}
+        self.plain_options = {dim: [self.option('All', False)] + [self.option(value, False) for value in values] for dim, values in self.values.items()}
+        self.default_options = {dim: self.option('All', True) + ''.join(markup[1:]) for dim, markup in self.plain_options.items()}
+        self.json = json.dumps({
+            "dataset_version": version,
+            "dimensions": {dim: {"values": self.values[dim], "counts": self.counts[dim]} for dim in self.values},
+            "models_by_make": self.models_by_make
+        })
+
+    @staticmethod
+    def option(value, selected):
+        value = html_escape(value)
+        return f'<option value="{value}" {"selected" if selected else ""}>{value}</option>'
+
+    def options(self, dim, selected):
+        # Only the selected entries differ from the prebuilt markup
+        if not selected or selected == ['All']:
+            return self.default_options.get(dim, self.option('All', True))
+        markup = list(self.plain_options.get(dim, [self.option('All', False)]))
+        for value in selected:
+            position = 0 if value == 'All' else self.positions[dim].get(value)
+            if position is not None:
+                markup[position] = self.option(value, True)
+        return ''.join(markup)
+
+# Helper function to rebuild a frame on read-only column arrays that all request threads share
+def freeze_frame(df):
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, np.dtype):
+            values = df[col].to_numpy()
+            values.flags.writeable = False
+        else:
+            values = df[col].array
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+class DatasetView:
+    # Read-only row selection over a frozen frame; columns are only gathered when a caller needs them
+    def __init__(self, df, rows=None):
+        self.df = df
+        self.rows = rows
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.df) if self.rows is None else len(self.rows)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def column(self, name):
+        if name not in self._columns:
+            values = self.df[name]
+            self._columns[name] = values if self.rows is None else values.take(self.rows)
+        return self._columns[name]
+
+    def to_frame(self, columns=None):
+        frame = self.df if columns is None else self.df[list(columns)]
+        return frame if self.rows is None else frame.take(self.rows)
+
+    def where(self, mask):
+        # Narrows the selection with a boolean mask aligned to the selected rows
+        positions = np.flatnonzero(mask)
+        return DatasetView(self.df, positions if self.rows is None else self.rows[positions])
+
+    def iter_frames(self, chunk_rows, columns=None):
+        # Materializes the selection one chunk of rows at a time
+        frame = self.df if columns is None else self.df[list(columns)]
+        for start in range(0, len(self), chunk_rows):
+            if self.rows is None:
+                yield frame.iloc[start:start + chunk_rows]
+            else:
+                yield frame.take(self.rows[start:start + chunk_rows])
+
+# Synthetic data scale: sales rows, multiplier for the HR / inventory / CRM / demographics / time-log tables, and seed
+SALES_ROWS = int(os.environ.get('SALES_ROWS', 1000))
+DATA_AUX_SCALE = int(os.environ.get('DATA_AUX_SCALE', 1))
+DATA_SEED = int(os.environ['DATA_SEED']) if os.environ.get('DATA_SEED') else None
+
+# Dates of the auxiliary tables stay inside this window whatever DATA_AUX_SCALE is
+AUX_DATE_START = pd.Timestamp("2018-01-01")
+AUX_DATE_END = pd.Timestamp("2025-07-13")
+AUX_DATE_DAYS = (AUX_DATE_END - AUX_DATE_START).days + 1
+
+# Helper function to generate one auxiliary table; a failure is logged and leaves that table empty
+def generate_table(name, build):
+    try:
+        return build()
+    except Exception as e:
+        logging.error(f"Error generating {name} data: {str(e)}")
+        return pd.DataFrame()
+
+# On-disk snapshot shared by all workers: <dir>/manifest.json points at <dir>/<version>/ holding one .npy per column.
+# Ingested sales rows are stored as extra segments of the sales columns (merged back into one file after
+# SNAPSHOT_MAX_SEGMENTS). The manifest's lineage lists the earlier versions this one grew from by ingestion: their
+# sales rows and cube cells come first in this version (cube measures may have been added to since).
+DATASET_SNAPSHOT_DIR = os.environ.get('DATASET_SNAPSHOT_DIR')
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_MAX_SEGMENTS = int(os.environ.get('SNAPSHOT_MAX_SEGMENTS', 32))
+SNAPSHOT_TABLES = ['df', 'cube', 'hr_data', 'inventory_data', 'crm_data', 'demo_data', 'time_log_data']
+
+# Helper function to pick the narrowest integer type for codes into the given categories
+def narrowest_code_dtype(categories):
+    return np.int8 if len(categories) < 128 else np.int16 if len(categories) < 32768 else np.int32
+
+# Helper function to write a column as one .npy file; text columns are stored as categorical codes
+def write_column(values, path, filename):
+    spec = {"name": values.name, "file": filename}
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufM':
+        np.save(os.path.join(path, filename), values.to_numpy())
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+        categories = uniques.tolist()
+        np.save(os.path.join(path, filename), codes.astype(narrowest_code_dtype(categories)))
+        spec["categories"] = categories
+    return spec
+
+# Helper function to write a frame as one .npy file per column
+def write_frame_columns(df, path, table):
+    columns = [write_column(df[col], path, f"{table}.{position}.npy") for position, col in enumerate(df.columns)]
+    return {"rows": len(df), "columns": columns}
+
+# Helper function to write a frame that grew by appended rows: the previous version's files of each column are
+# linked and only the new rows are saved, as one more segment. A column is rewritten whole when its stored
+# codes would change (a new category sorting before existing ones, or a wider code type) or when it reached
+# SNAPSHOT_MAX_SEGMENTS.
+def append_frame_columns(df, spec, source, path, table):
+    start = spec["rows"]
+    columns = []
+    for position, (col, previous) in enumerate(zip(df.columns, spec["columns"])):
+        values = df[col]
+        segments = previous.get("segments", [])
+        appendable = previous["name"] == col and len(segments) < SNAPSHOT_MAX_SEGMENTS
+        if "categories" in previous:
+            categories = values.cat.categories.tolist() if isinstance(values.dtype, pd.CategoricalDtype) else None
+            appendable = appendable and categories is not None and (
+                categories[:len(previous["categories"])] == previous["categories"]
+                and narrowest_code_dtype(categories) == narrowest_code_dtype(previous["categories"])
+            )
+        else:
+            appendable = appendable and isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufM'
+        if not appendable:
+            columns.append(write_column(values, path, f"{table}.{position}.npy"))
+            continue
+        link_frame_columns({"columns": [previous]}, source, path)
+        filename = f"{table}.{position}.{len(segments) + 1}.npy"
+        if "categories" in previous:
+            np.save(os.path.join(path, filename), values.cat.codes.to_numpy()[start:].astype(narrowest_code_dtype(categories)))
+            columns.append({**previous, "categories": categories, "segments": segments + [filename]})
+        else:
+            np.save(os.path.join(path, filename), values.to_numpy()[start:])
+            columns.append({**previous, "segments": segments + [filename]})
+    return {"rows": len(df), "columns": columns}
+
+# Helper function to carry a table of a previous snapshot version into a new one: column files are never
+# modified once written, so they are hard-linked (copied where the filesystem has no hard links)
+def link_frame_columns(spec, source, path):
+    for column in spec["columns"]:
+        for filename in [column["file"], *column.get("segments", [])]:
+            try:
+                os.link(os.path.join(source, filename), os.path.join(path, filename))
+            except OSError:
+                shutil.copyfile(os.path.join(source, filename), os.path.join(path, filename))
+    return spec
+
+# Helper function to memory-map a frame written by write_frame_columns (read-only, shared through the page cache);
+# a column with appended segments is read into one private array
+def read_frame_columns(spec, path):
+    columns = {}
+    for column in spec["columns"]:
+        parts = [np.load(os.path.join(path, filename), mmap_mode='r') for filename in [column["file"], *column.get("segments", [])]]
+        values = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        if "categories" in column:
+            values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(column["categories"]), validate=False)
+        columns[column["name"]] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(spec["rows"]), copy=False)
+
+# Loading real data: DATA_DIR holds one file per table (<name>.parquet or <name>.csv). Column kinds are explicit:
+# 'category' text is read dictionary-encoded, 'date' is parsed once per distinct string with DATA_DATE_FORMAT,
+# 'int64' / 'float64' are numeric and 'text' stays object. Rows with a missing or unparsable value are dropped.
+DATA_DIR = os.environ.get('DATA_DIR')
+DATA_DATE_FORMAT = os.environ.get('DATA_DATE_FORMAT', '%Y-%m-%d')
+LOAD_CHUNK_ROWS = int(os.environ.get('LOAD_CHUNK_ROWS', 1000000))
+TABLE_SOURCES = {
+    'df': ('sales', {
+        'salesperson': 'category', 'car_make': 'category', 'car_model': 'category', 'car_year': 'int64',
+        'date': 'date', 'sale_price': 'float64', 'commission_earned': 'float64'
+    }),
+    'hr_data': ('hr', {
+        'employee_id': 'text', 'name': 'text', 'role': 'category', 'department': 'category',
+        'join_date': 'date', 'salary_usd': 'float64', 'performance_score': 'float64'
+    }),
+    'inventory_data': ('inventory', {
+        'part_id': 'text', 'part_name': 'text', 'car_make': 'category', 'stock_level': 'int64',
+        'reorder_level': 'int64', 'unit_cost': 'float64'
+    }),
+    'crm_data': ('crm', {
+        'customer_id': 'text', 'customer_name': 'text', 'contact_date': 'date', 'interaction_type': 'category',
+        'salesperson': 'category', 'satisfaction_score': 'float64'
+    }),
+    'demo_data': ('demographics', {
+        'customer_id': 'text', 'age_group': 'category', 'region': 'category', 'purchase_amount': 'float64',
+        'preferred_make': 'category'
+    }),
+    'time_log_data': ('time_log', {
+        'employee_id': 'text', 'date': 'date', 'clock_in': 'text', 'clock_out': 'text', 'total_hours': 'float64'
+    })
+}
+
+# Helper function to find the source file of a table, preferring Parquet over CSV
+def find_table_file(data_dir, name):
+    for extension in ['parquet', 'csv']:
+        path = os.path.join(data_dir, f"{name}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+# Helper function to identify the current source files, so a snapshot built from older files is regenerated
+def data_source_signature(data_dir):
+    signature = {}
+    for name, _ in TABLE_SOURCES.values():
+        path = find_table_file(data_dir, name)
+        if path is not None:
+            stat = os.stat(path)
+            signature[os.path.basename(path)] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+# Helper function to read a table file in chunks with explicit dtypes; text dimensions and dates arrive as categoricals
+def read_table_chunks(path, columns, chunk_rows=LOAD_CHUNK_ROWS):
+    dictionary_columns = [col for col, kind in columns.items() if kind in ('category', 'date')]
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise RuntimeError("pyarrow is required to load Parquet files")
+        parquet_file = pq.ParquetFile(path, read_dictionary=dictionary_columns)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=list(columns)):
+            yield batch.to_pandas()
+    else:
+        # Integers are read as floats so a blank cell is dropped as invalid instead of failing the whole load
+        dtypes = {col: {'category': 'category', 'date': 'category', 'int64': 'float64', 'float64': 'float64', 'text': 'object'}[kind]
+                  for col, kind in columns.items()}
+        yield from pd.read_csv(path, usecols=list(columns), dtype=dtypes, chunksize=chunk_rows)
+
+# Helper function to parse a date column; categorical strings are parsed once per distinct value
+def parse_date_column(values, date_format=DATA_DATE_FORMAT):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = pd.to_datetime(values)
+        return (dates.dt.tz_localize(None) if dates.dt.tz is not None else dates).to_numpy(dtype='datetime64[ns]')
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype('category')
+    parsed = pd.to_datetime(values.cat.categories.astype(str), format=date_format, errors='coerce').to_numpy(dtype='datetime64[ns]')
+    codes = values.cat.codes.to_numpy()
+    return np.where(codes >= 0, parsed[np.maximum(codes, 0)], np.datetime64('NaT'))
+
+# Helper function to coerce one chunk to the table's column kinds, returning the valid rows and the dropped count
+def coerce_chunk(chunk, columns, date_format=DATA_DATE_FORMAT):
+    coerced = {}
+    invalid = np.zeros(len(chunk), dtype=bool)
+    for col, kind in columns.items():
+        values = chunk[col]
+        if kind == 'date':
+            values = parse_date_column(values, date_format)
+            invalid |= np.isnat(values)
+        elif kind in ('int64', 'float64'):
+            values = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+            invalid |= np.isnan(values)
+            if kind == 'int64':
+                invalid |= ~np.isnan(values) & (values != np.round(values))
+        elif kind == 'category':
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(str).where(values.notna()).astype('category')
+            invalid |= values.isna().to_numpy()
+        else:
+            invalid |= values.isna().to_numpy()
+        coerced[col] = values
+    valid = ~invalid
+    frame = {}
+    for col, kind in columns.items():
+        values = coerced[col]
+        if kind == 'int64':
+            frame[col] = values[valid].astype(np.int64)
+        elif kind == 'category':
+            frame[col] = pd.Categorical(values[valid])
+        elif kind == 'text':
+            frame[col] = values.to_numpy(dtype=object)[valid]
+        else:
+            frame[col] = values[valid]
+    return pd.DataFrame(frame), int(invalid.sum())
+
+# Helper function to load one table: chunks are coerced as they are read, then concatenated column by column
+def load_table(path, columns, date_format=DATA_DATE_FORMAT, chunk_rows=LOAD_CHUNK_ROWS):
+    chunks, dropped = [], 0
+    for chunk in read_table_chunks(path, columns, chunk_rows):
+        missing = [col for col in columns if col not in chunk]
+        if missing:
+            raise ValueError(f"{os.path.basename(path)} is missing columns: {', '.join(missing)}")
+        frame, invalid = coerce_chunk(chunk, columns, date_format)
+        chunks.append(frame)
+        dropped += invalid
+    if dropped:
+        logging.warning(f"{os.path.basename(path)}: dropped {dropped:,} rows with missing or invalid values")
+    if not chunks:
+        return empty_table(columns)
+    table = {}
+    for col, kind in columns.items():
+        if kind == 'category':
+            table[col] = pd.api.types.union_categoricals([chunk[col].array for chunk in chunks], sort_categories=True)
+        else:
+            table[col] = np.concatenate([chunk[col].to_numpy() for chunk in chunks])
+    return pd.DataFrame(table, copy=False)
+
+# Helper function to build an empty table with the right columns and dtypes
+def empty_table(columns):
+    dtypes = {'category': 'category', 'date': 'datetime64[ns]', 'int64': 'int64', 'float64': 'float64', 'text': 'object'}
+    return pd.DataFrame({col: pd.Series(dtype=dtypes[kind]) for col, kind in columns.items()})
+
+# Helper function to add the calendar columns the sales views group by; computed once per distinct day
+def add_calendar_columns(df):
+    days, day_codes = np.unique(df['date'].to_numpy().astype('datetime64[D]'), return_inverse=True)
+    periods = pd.DatetimeIndex(days)
+    df['year'] = periods.year.to_numpy().astype(np.int32)[day_codes]
+    for col, freq in [('quarter', 'Q'), ('month', 'M')]:
+        labels, label_codes = np.unique(periods.to_period(freq).astype(str), return_inverse=True)
+        df[col] = pd.Categorical.from_codes(label_codes[day_codes], labels)
+    return df
+
+# Compact in-memory schema: repeated text dimensions are categoricals, years are int16 and month / quarter are
+# categorical codes over their period labels ('YYYY-MM' / 'YYYYQn' sort chronologically, so the codes are in
+# period order). Money stays float64 unless SALES_MONEY_DTYPE=float32; the cube always sums it in float64.
+SALES_MONEY_DTYPE = os.environ.get('SALES_MONEY_DTYPE', 'float64')
+SALES_SCHEMA = {
+    'salesperson': 'category', 'car_make': 'category', 'car_model': 'category', 'car_year': 'int16',
+    'sale_price': SALES_MONEY_DTYPE, 'commission_earned': SALES_MONEY_DTYPE,
+    'year': 'int16', 'quarter': 'category', 'month': 'category'
+}
+CUBE_SCHEMA = {
+    'salesperson': 'category', 'car_make': 'category', 'car_model': 'category', 'car_year': 'int16',
+    'month': 'category', 'quarter': 'category', 'sale_price': 'float64', 'commission_earned': 'float64',
+    'sale_price_count': 'int32', 'commission_earned_count': 'int32', 'transactions': 'int32'
+}
+
+# Helper function to convert a frame to a compact schema; an integer column that does not fit its target keeps its dtype
+def compact_frame(df, schema):
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        target = schema.get(col)
+        if target == 'category':
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = pd.Categorical(values.to_numpy(dtype=object))
+        elif target is not None and values.dtype != target:
+            if np.dtype(target).kind in 'iu' and len(values) and (
+                    values.min() < np.iinfo(target).min or values.max() > np.iinfo(target).max):
+                logging.warning(f"Column {col} does not fit {target}, keeping {values.dtype}")
+            else:
+                values = values.to_numpy().astype(target)
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+# Helper function to measure a column in bytes; object values are sized one by one because pandas' deep
+# measurement rejects the read-only arrays of frozen frames
+def column_bytes(values):
+    if values.dtype == object:
+        array = values.to_numpy()
+        return int(array.nbytes + sum(sys.getsizeof(value) for value in array))
+    return int(values.memory_usage(index=False, deep=True))
+
+# Helper function to report the in-memory size of each table and column in bytes
+def memory_report(tables):
+    report = {}
+    for table, df in tables.items():
+        columns = {col: column_bytes(df[col]) for col in df.columns}
+        report[table] = {"rows": len(df), "bytes": sum(columns.values()), "columns": columns}
+    return report
+
+# Columns a posted sale must carry; year / quarter / month are derived from the date
+SALES_INPUT_COLUMNS = ['salesperson', 'car_make', 'car_model', 'car_year', 'date', 'sale_price', 'commission_earned']
+SNAPSHOT_POLL_SECONDS = float(os.environ.get('SNAPSHOT_POLL_SECONDS', 1))
+
+# Helper function to validate posted sales against the sales table's column dtypes and derive the calendar
+# columns for these rows only
+def prepare_sales_batch(batch, dtypes):
+    missing = [col for col in SALES_INPUT_COLUMNS if col not in batch]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    dates = pd.to_datetime(batch['date'], errors='coerce')
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    car_year = pd.to_numeric(batch['car_year'], errors='coerce')
+    sale_price = pd.to_numeric(batch['sale_price'], errors='coerce')
+    commission = pd.to_numeric(batch['commission_earned'], errors='coerce')
+    text = {col: batch[col].astype(object).where(batch[col].notna()) for col in ['salesperson', 'car_make', 'car_model']}
+    invalid = dates.isna() | car_year.isna() | (car_year != car_year.round()) | sale_price.isna()
+    for values in text.values():
+        invalid |= values.isna() | (values.astype(str).str.strip() == '')
+    if invalid.any():
+        raise ValueError(f"{int(invalid.sum())} invalid rows (first at position {int(np.flatnonzero(invalid.to_numpy())[0])})")
+    prepared = pd.DataFrame({
+        'salesperson': text['salesperson'].astype(str).to_numpy(dtype=object),
+        'car_make': text['car_make'].astype(str).to_numpy(dtype=object),
+        'car_year': car_year.to_numpy().astype(np.int64),
+        'date': dates.to_numpy(dtype='datetime64[ns]'),
+        'sale_price': sale_price.to_numpy(dtype=np.float64),
+        'commission_earned': commission.to_numpy(dtype=np.float64),
+        'car_model': text['car_model'].astype(str).to_numpy(dtype=object),
+        'year': dates.dt.year.to_numpy().astype(np.int32),
+        'quarter': dates.dt.to_period('Q').astype(str).to_numpy(dtype=object),
+        'month': dates.dt.to_period('M').astype(str).to_numpy(dtype=object)
+    })
+    # Integer columns may be narrower than int64 (see SALES_SCHEMA); a value that does not fit would wrap around
+    for col, dtype in dtypes.items():
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+            values = prepared[col].to_numpy()
+            outside = (values < np.iinfo(dtype).min) | (values > np.iinfo(dtype).max)
+            if outside.any():
+                raise ValueError(f"{col} out of range (first at position {int(np.flatnonzero(outside)[0])})")
+    return prepared[list(dtypes.index)]
+
+# Helper function to append values to a column, keeping categorical columns categorical
+def append_column(column, values):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return pd.api.types.union_categoricals(
+            [column.array, pd.Categorical(values.to_numpy(dtype=object))], sort_categories=True
+        )
+    if isinstance(column.dtype, np.dtype):
+        return np.concatenate([column.to_numpy(), values.to_numpy().astype(column.dtype)])
+    return pd.concat([column, values], ignore_index=True).array
+
 class AutomotiveDashboard:
-    def __init__(self):
-        self.df = self.generate_sales_data()
-        logging.info("Sales data generated successfully")
-        self.hr_data, self.inventory_data, self.crm_data, self.demo_data, self.time_log_data = self.generate_fake_data()
+    def __init__(self, sales_rows=SALES_ROWS, aux_scale=DATA_AUX_SCALE, seed=DATA_SEED, snapshot_dir=DATASET_SNAPSHOT_DIR, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self.sales_rows = sales_rows
+        self.aux_scale = aux_scale
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
         self.car_models = {
             'Toyota': ['Camry', 'Corolla', 'RAV4'],
             'Honda': ['Civic', 'Accord', 'CR-V'],
@@ -40,2310 +683,2249 @@ class AutomotiveDashboard:
             'Hyundai': ['Elantra', 'Sonata', 'Tucson'],
             'Volkswagen': ['Jetta', 'Passat', 'Tiguan']
         }
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_mtime = None
+        self.snapshot_checked = 0.0
+        self.snapshot_loader = None
+        self.lock = threading.Lock()
+        self.cube_keys = None
+        if snapshot_dir:
+            self.load_or_create_snapshot(snapshot_dir)
+        else:
+            self.build_tables()
+            # Stamp identifying this dataset; caches key on it so a data change invalidates them
+            self.install({table: getattr(self, table) for table in SNAPSHOT_TABLES}, uuid.uuid4().hex[:12])
+        sales = memory_report({'df': self.df})['df']
+        logging.info(f"Sales table in memory: {sales['bytes']:,} bytes for {sales['rows']:,} rows ("
+                     + ", ".join(f"{col} {size / sales['rows'] if sales['rows'] else 0:.1f} B/row" for col, size in sales['columns'].items()) + ")")
+
+    def build_tables(self):
+        if self.data_dir:
+            self.load_tables(self.data_dir)
+        else:
+            self.generate_tables()
+
+    def load_tables(self, data_dir):
+        started = time.perf_counter()
+        for table, (name, columns) in TABLE_SOURCES.items():
+            path = find_table_file(data_dir, name)
+            if path is None:
+                if table == 'df':
+                    raise FileNotFoundError(f"No sales.parquet or sales.csv in {data_dir}")
+                logging.info(f"No {name} file in {data_dir}, the {name} views will be empty")
+                frame = empty_table(columns)
+            else:
+                frame = load_table(path, columns)
+                logging.info(f"Loaded {len(frame):,} rows from {path}")
+            if table == 'df':
+                frame = compact_frame(add_calendar_columns(frame), SALES_SCHEMA)
+            setattr(self, table, freeze_frame(frame))
+        self.cube = freeze_frame(self.build_aggregate_cube(self.df))
+        logging.info(f"Aggregate cube built: {len(self.df):,} rows -> {len(self.cube):,} cells ({time.perf_counter() - started:.1f}s total)")
+
+    def generate_tables(self):
+        self.df = freeze_frame(compact_frame(self.generate_sales_data(), SALES_SCHEMA))
+        logging.info(f"Sales data generated successfully ({len(self.df):,} rows)")
+        self.hr_data, self.inventory_data, self.crm_data, self.demo_data, self.time_log_data = map(freeze_frame, self.generate_fake_data())
+        self.cube = freeze_frame(self.build_aggregate_cube(self.df))
+        logging.info(f"Aggregate cube built: {len(self.df):,} rows -> {len(self.cube):,} cells")
+
+    def snapshot_params(self):
+        if self.data_dir:
+            return {"data_dir": os.path.abspath(self.data_dir), "files": data_source_signature(self.data_dir)}
+        return {"sales_rows": self.sales_rows, "aux_scale": self.aux_scale, "seed": self.seed}
+
+    def load_or_create_snapshot(self, snapshot_dir):
+        # Workers serialize on a lock file: the first one generates and writes the snapshot, the rest map it
+        os.makedirs(snapshot_dir, exist_ok=True)
+        manifest_path = os.path.join(snapshot_dir, 'manifest.json')
+        with open(os.path.join(snapshot_dir, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                manifest = None
+                if os.path.exists(manifest_path):
+                    with open(manifest_path) as f:
+                        manifest = json.load(f)
+                    if manifest.get("format") != SNAPSHOT_FORMAT or manifest.get("params") != self.snapshot_params():
+                        logging.info(f"Snapshot {manifest.get('version')} is stale, regenerating")
+                        manifest = None
+                if manifest is None:
+                    self.build_tables()
+                    manifest = self.write_snapshot(snapshot_dir)
+                self.load_snapshot(snapshot_dir, manifest)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def write_snapshot(self, snapshot_dir, version=None, previous=None, changed=SNAPSHOT_TABLES, appended=()):
+        # Tables outside `changed` are linked from the previous manifest's version instead of being rewritten,
+        # and the rows the tables in `appended` gained since then are written as new column segments
+        version = version or uuid.uuid4().hex[:12]
+        path = os.path.join(snapshot_dir, version)
+        os.makedirs(path)
+        tables = {}
+        for table in SNAPSHOT_TABLES:
+            source = previous and os.path.join(snapshot_dir, previous["version"])
+            if previous is not None and table not in changed:
+                tables[table] = link_frame_columns(previous["tables"][table], source, path)
+            elif previous is not None and table in appended:
+                tables[table] = append_frame_columns(getattr(self, table), previous["tables"][table], source, path, table)
+            else:
+                tables[table] = write_frame_columns(getattr(self, table), path, table)
+        lineage = []
+        if previous is not None and appended:
+            base = {"version": previous["version"], "rows": {table: spec["rows"] for table, spec in previous["tables"].items()}}
+            lineage = (previous.get("lineage", []) + [base])[-SNAPSHOT_MAX_SEGMENTS:]
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "version": version,
+            "created": datetime.now().isoformat(timespec='seconds'),
+            "params": self.snapshot_params(),
+            "lineage": lineage,
+            "tables": tables
+        }
+        tmp_path = os.path.join(snapshot_dir, f'manifest.json.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(snapshot_dir, 'manifest.json'))
+        for entry in os.listdir(snapshot_dir):
+            if entry != version and os.path.isdir(os.path.join(snapshot_dir, entry)):
+                shutil.rmtree(os.path.join(snapshot_dir, entry), ignore_errors=True)
+        logging.info(f"Dataset snapshot {version} written to {path}")
+        return manifest
+
+    def load_snapshot(self, snapshot_dir, manifest, mtime=None):
+        # When the installed version is in the manifest's lineage, its rows are a prefix of the new tables
+        # and the filter indexes are only extended by the rows appended since
+        path = os.path.join(snapshot_dir, manifest["version"])
+        tables = {table: freeze_frame(read_frame_columns(manifest["tables"][table], path)) for table in SNAPSHOT_TABLES}
+        base = next((entry["rows"] for entry in manifest.get("lineage", []) if entry["version"] == getattr(self, 'version', None)), None)
+        sales_index = cube_index = None
+        if base is not None and base.get('df') == self.sales_index.size and base.get('cube') == self.cube_index.size:
+            sales_index = self.sales_index.extended(tables['df'].iloc[base['df']:])
+            cube_index = self.cube_index.extended(tables['cube'].iloc[base['cube']:])
+        self.install(tables, manifest["version"], sales_index, cube_index)
+        self.snapshot_mtime = mtime or os.stat(os.path.join(snapshot_dir, 'manifest.json')).st_mtime_ns
+        logging.info(f"Dataset snapshot {self.version} memory-mapped ({len(self.df):,} sales rows"
+                     + (f", {len(self.df) - base['df']:,} appended" if sales_index is not None else "") + ")")
+
+    def install(self, tables, version, sales_index=None, cube_index=None, cube_keys=None):
+        # Publishes a dataset: derived structures are built first and the version is set last, so a request
+        # that pinned the new version never reads the old tables (requests pin the version when they start)
+        sales_index = sales_index or FilterIndex(tables['df'])
+        cube_index = cube_index or FilterIndex(tables['cube'])
+        dimensions = DimensionDictionary(sales_index, version)
+        for table, frame in tables.items():
+            setattr(self, table, frame)
+        self.sales_index, self.cube_index, self.dimensions, self.cube_keys = sales_index, cube_index, dimensions, cube_keys
+        self.version = version
+
+    def sync_snapshot(self, interval=SNAPSHOT_POLL_SECONDS):
+        # Notices a snapshot another worker published (e.g. after an ingestion); the manifest is polled at most
+        # once per interval and the snapshot is loaded on a background thread, so no request waits for it:
+        # requests keep using the installed dataset until the new one is published
+        if not self.snapshot_dir or time.monotonic() - self.snapshot_checked < interval:
+            return
+        self.snapshot_checked = time.monotonic()
+        try:
+            if os.stat(os.path.join(self.snapshot_dir, 'manifest.json')).st_mtime_ns == self.snapshot_mtime:
+                return
+        except Exception as e:
+            logging.error(f"Error syncing dataset snapshot: {str(e)}")
+            return
+        if self.snapshot_loader is None or not self.snapshot_loader.is_alive():
+            self.snapshot_loader = threading.Thread(target=self.refresh_snapshot, name='snapshot-loader', daemon=True)
+            self.snapshot_loader.start()
+
+    def refresh_snapshot(self):
+        # Loads the published snapshot when it is not the installed version
+        manifest_path = os.path.join(self.snapshot_dir, 'manifest.json')
+        try:
+            with self.lock:
+                mtime = os.stat(manifest_path).st_mtime_ns
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+                if manifest["version"] != self.version:
+                    self.load_snapshot(self.snapshot_dir, manifest, mtime)
+                else:
+                    self.snapshot_mtime = mtime
+        except Exception as e:
+            logging.error(f"Error syncing dataset snapshot: {str(e)}")
+
+    def append_sales(self, batch):
+        # Appends validated transactions (see prepare_sales_batch) without rebuilding: derived columns are
+        # computed for the batch only, the filter indexes are extended, and the batch's cube cells are added
+        # onto matching cells or appended as new ones. With a snapshot directory the result is written as a
+        # new snapshot under the lock, so other workers pick it up and concurrent appends are not lost.
+        if self.snapshot_dir:
+            with open(os.path.join(self.snapshot_dir, '.lock'), 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self.refresh_snapshot()
+                    with self.lock:
+                        with open(os.path.join(self.snapshot_dir, 'manifest.json')) as f:
+                            previous = json.load(f)
+                        if previous["version"] != self.version:
+                            previous = None
+                        self.apply_sales_batch(batch)
+                        self.write_snapshot(self.snapshot_dir, self.version, previous, changed=['df', 'cube'], appended=['df'])
+                        self.snapshot_mtime = os.stat(os.path.join(self.snapshot_dir, 'manifest.json')).st_mtime_ns
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        else:
+            with self.lock:
+                self.apply_sales_batch(batch)
+        logging.info(f"Appended {len(batch):,} sales rows ({len(self.df):,} total), dataset version {self.version}")
+
+    def apply_sales_batch(self, batch):
+        offset = len(self.df)
+        batch = batch.set_axis(pd.RangeIndex(offset, offset + len(batch)))
+        df = freeze_frame(pd.DataFrame(
+            {col: append_column(self.df[col], batch[col]) for col in self.df.columns},
+            index=pd.RangeIndex(offset + len(batch)), copy=False
+        ))
+        sales_index = self.sales_index.extended(batch)
+
+        batch_cube = self.build_aggregate_cube(batch)
+        cube_keys = self.cube_keys
+        if cube_keys is None:
+            cube_keys = pd.MultiIndex.from_frame(self.cube[CUBE_DIMENSIONS].astype(object))
+        batch_keys = pd.MultiIndex.from_frame(batch_cube[CUBE_DIMENSIONS].astype(object))
+        positions = cube_keys.get_indexer(batch_keys)
+        matched = positions >= 0
+        new_cells = batch_cube[~matched].set_axis(pd.RangeIndex(len(self.cube), len(self.cube) + int((~matched).sum())))
+        cube_columns = {}
+        for col in self.cube.columns:
+            if col in CUBE_MEASURES:
+                values = self.cube[col].to_numpy().copy()
+                values[positions[matched]] += batch_cube[col].to_numpy()[matched].astype(values.dtype)
+                cube_columns[col] = append_column(pd.Series(values), new_cells[col])
+            else:
+                cube_columns[col] = append_column(self.cube[col], new_cells[col])
+        cube = freeze_frame(pd.DataFrame(cube_columns, index=pd.RangeIndex(len(self.cube) + len(new_cells)), copy=False))
+        cube_index = self.cube_index.extended(new_cells)
+        cube_keys = cube_keys.append(pd.MultiIndex.from_frame(new_cells[CUBE_DIMENSIONS].astype(object)))
+
+        tables = {table: getattr(self, table) for table in SNAPSHOT_TABLES}
+        tables.update(df=df, cube=cube)
+        self.install(tables, uuid.uuid4().hex[:12], sales_index, cube_index, cube_keys)
 
     def generate_sales_data(self):
         try:
-            car_makes = ['Toyota', 'Honda', 'Ford', 'Chevrolet', 'BMW', 'Mercedes', 'Hyundai', 'Volkswagen']
-            salespeople = [f"Salesperson {i}" for i in range(1, 11)]
+            rng = self.rng
+            n = self.sales_rows
+            car_makes = list(self.car_models)
+            salespeople = np.array([f"Salesperson {i}" for i in range(1, 11)], dtype=object)
             dates = pd.date_range(start="2023-01-01", end="2025-07-13", freq="D")
-            data = {
-                'salesperson': [random.choice(salespeople) for _ in range(1000)],
-                'car_make': [random.choice(car_makes) for _ in range(1000)],
-                'car_year': [random.randint(2018, 2025) for _ in range(1000)],
-                'date': [random.choice(dates) for _ in range(1000)],
-                'sale_price': [round(random.uniform(15000, 100000), 2) for _ in range(1000)],
-                'commission_earned': [round(random.uniform(500, 5000), 2) for _ in range(1000)]
-            }
-            df = pd.DataFrame(data)
-            df['car_model'] = df['car_make'].apply(lambda x: random.choice(self.car_models[x]))
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
-            df['year'] = df['date'].dt.year
-            df['quarter'] = df['date'].dt.to_period('Q').astype(str)
-            df['month'] = df['date'].dt.to_period('M').astype(str)
+            # Flattened make -> model table: model code = make code * models per make + model offset
+            models_per_make = len(self.car_models[car_makes[0]])
+            model_names = np.array([m for make in car_makes for m in self.car_models[make]], dtype=object)
+            make_codes = rng.integers(0, len(car_makes), n)
+            model_codes = make_codes * models_per_make + rng.integers(0, models_per_make, n)
+            # Dates are drawn as day offsets so year / quarter / month are gathered from per-day lookup tables
+            day_codes = rng.integers(0, len(dates), n)
+            df = pd.DataFrame({
+                'salesperson': salespeople[rng.integers(0, len(salespeople), n)],
+                'car_make': np.array(car_makes, dtype=object)[make_codes],
+                'car_year': rng.integers(2018, 2026, n),
+                'date': dates.values[day_codes],
+                'sale_price': rng.uniform(15000, 100000, n).round(2),
+                'commission_earned': rng.uniform(500, 5000, n).round(2),
+                'car_model': model_names[model_codes],
+                'year': dates.year.values.astype(np.int32)[day_codes],
+                'quarter': dates.to_period('Q').astype(str).values.astype(object)[day_codes],
+                'month': dates.to_period('M').astype(str).values.astype(object)[day_codes]
+            })
             return df
         except Exception as e:
             logging.error(f"Error generating sales data: {str(e)}")
             return pd.DataFrame()
 
     def generate_fake_data(self):
+        # Each table is generated on its own, so one failing leaves the others in place
+        hr_data = generate_table('HR', self.generate_hr_data)
+        time_log_data = generate_table('time log', lambda: self.generate_time_log_data(hr_data))
+        inventory_data = generate_table('inventory', self.generate_inventory_data)
+        customer_numbers = np.arange(20 * self.aux_scale)
+        crm_data = generate_table('CRM', lambda: self.generate_crm_data(customer_numbers))
+        demo_data = generate_table('demographics', lambda: self.generate_demo_data(customer_numbers))
+        logging.info("Fake data generated successfully")
+        return hr_data, inventory_data, crm_data, demo_data, time_log_data
+
+    def generate_hr_data(self):
+        n_employees = 10 * self.aux_scale
+        roles = ["Sales Exec", "Manager", "Technician", "Clerk", "Sales Exec", "Technician", "HR", "Manager", "Clerk", "Sales Exec"]
+        departments = ["Sales", "Sales", "Service", "Admin", "Sales", "Service", "HR", "Sales", "Admin", "Sales"]
+        employee_numbers = np.arange(n_employees)
+        return pd.DataFrame({
+            "employee_id": [f"E{1000+i}" for i in employee_numbers],
+            "name": [f"Employee {i}" for i in employee_numbers + 1],
+            "role": np.resize(np.array(roles, dtype=object), n_employees),
+            "department": np.resize(np.array(departments, dtype=object), n_employees),
+            # One hire every 180 days, wrapping around inside the generated date window
+            "join_date": AUX_DATE_START + pd.to_timedelta(employee_numbers * 180 % AUX_DATE_DAYS, unit='D'),
+            "salary_usd": 50000 + employee_numbers * 1500,
+            "performance_score": self.rng.uniform(2.5, 5.0, n_employees).round(1)
+        })
+
+    def generate_time_log_data(self, hr_data):
+        rng = self.rng
+        n_logs = 30 * self.aux_scale
+        clock_in_minutes = pd.Series(rng.integers(0, 60, n_logs)).astype(str).str.zfill(2)
+        clock_out_minutes = pd.Series(rng.integers(0, 60, n_logs)).astype(str).str.zfill(2)
+        return pd.DataFrame({
+            "employee_id": rng.choice(hr_data["employee_id"].to_numpy(), size=n_logs, replace=True),
+            # One log per day counting back from the window's end, wrapping around inside the window
+            "date": AUX_DATE_END - pd.to_timedelta((n_logs - 1 - np.arange(n_logs)) % AUX_DATE_DAYS, unit='D'),
+            "clock_in": pd.Series(rng.integers(8, 11, n_logs)).astype(str) + ":" + clock_in_minutes + " AM",
+            "clock_out": pd.Series(rng.integers(16, 19, n_logs)).astype(str) + ":" + clock_out_minutes + " PM",
+            "total_hours": rng.uniform(6.5, 9.5, n_logs).round(1)
+        }).sort_values(by="date", ascending=False)
+
+    def generate_inventory_data(self):
+        rng = self.rng
+        n_parts = 20 * self.aux_scale
+        makes = np.asarray(self.df['car_make'].dropna().unique(), dtype=object)
+        part_numbers = np.arange(1, n_parts + 1)
+        part_types = np.array(["Filter", "Brake", "Tire", "Battery", "Sensor", "Pump"], dtype=object)
+        return pd.DataFrame({
+            "part_id": [f"P{i:04d}" for i in part_numbers],
+            "part_name": [f"Part {i} {t}" for i, t in zip(part_numbers, rng.choice(part_types, n_parts))],
+            "car_make": rng.choice(makes, n_parts),
+            "stock_level": rng.integers(0, 151, n_parts),
+            "reorder_level": rng.integers(10, 61, n_parts),
+            "unit_cost": rng.uniform(20, 600, n_parts).round(2)
+        })
+
+    def generate_crm_data(self, customer_numbers):
+        rng = self.rng
+        n_customers = len(customer_numbers)
+        salespeople = np.asarray(self.df['salesperson'].dropna().unique(), dtype=object)
+        start_date = AUX_DATE_END - pd.Timedelta(days=365)
+        return pd.DataFrame({
+            "customer_id": [f"C{100+i}" for i in customer_numbers],
+            "customer_name": [f"Customer {i}" for i in customer_numbers + 1],
+            "contact_date": start_date + pd.to_timedelta(rng.integers(0, 366, n_customers), unit='D'),
+            "interaction_type": rng.choice(np.array(["Inquiry", "Complaint", "Follow-up", "Feedback", "Service Request"], dtype=object), n_customers),
+            "salesperson": rng.choice(salespeople, n_customers),
+            "satisfaction_score": rng.uniform(1.0, 5.0, n_customers).round(1)
+        })
+
+    def generate_demo_data(self, customer_numbers):
+        rng = self.rng
+        n_customers = len(customer_numbers)
+        makes = np.asarray(self.df['car_make'].dropna().unique(), dtype=object)
+        states = ['California', 'Texas', 'New York', 'Florida', 'Illinois', 'Pennsylvania', 'Ohio', 'Michigan', 'Georgia', 'North Carolina']
+        return pd.DataFrame({
+            "customer_id": [f"C{100+i}" for i in customer_numbers],
+            "age_group": rng.choice(np.array(["18-25", "26-35", "36-45", "46-55", "55+"], dtype=object), n_customers),
+            "region": rng.choice(np.array(states, dtype=object), n_customers),
+            "purchase_amount": rng.uniform(15000, 100000, n_customers).round(2),
+            "preferred_make": rng.choice(makes, n_customers)
+        })
+
+    def build_aggregate_cube(self, df):
+        # Sums and counts per salesperson x make x model x year x month cell; means are derived as sum / count
         try:
-            hr_data = pd.DataFrame({
-                "employee_id": [f"E{1000+i}" for i in range(10)],
-                "name": [f"Employee {i}" for i in range(1, 11)],
-                "role": ["Sales Exec", "Manager", "Technician", "Clerk", "Sales Exec", "Technician", "HR", "Manager", "Clerk", "Sales Exec"],
-                "department": ["Sales", "Sales", "Service", "Admin", "Sales", "Service", "HR", "Sales", "Admin", "Sales"],
-                "join_date": pd.date_range(start="2018-01-01", periods=10, freq="180D"),
-                "salary_usd": [50000 + i*1500 for i in range(10)],
-                "performance_score": [round(x, 1) for x in np.random.uniform(2.5, 5.0, 10)]
-            })
-            end_date = pd.to_datetime("2025-07-13")
-            time_log_data = pd.DataFrame({
-                "employee_id": np.random.choice(hr_data["employee_id"], size=30, replace=True),
-                "date": pd.date_range(end=end_date, periods=30).tolist(),
-                "clock_in": [f"{random.randint(8, 10)}:{str(random.randint(0, 59)).zfill(2)} AM" for _ in range(30)],
-                "clock_out": [f"{random.randint(4, 6)+12}:{str(random.randint(0, 59)).zfill(2)} PM" for _ in range(30)],
-                "total_hours": [round(random.uniform(6.5, 9.5), 1) for _ in range(30)]
-            }).sort_values(by="date", ascending=False)
-            inventory_data = pd.DataFrame({
-                "part_id": [f"P{i:04d}" for i in range(1, 21)],
-                "part_name": [f"Part {i} " + random.choice(["Filter", "Brake", "Tire", "Battery", "Sensor", "Pump"]) for i in range(1, 21)],
-                "car_make": [random.choice(self.df['car_make'].dropna().unique()) for _ in range(20)],
-                "stock_level": [random.randint(0, 150) for _ in range(20)],
-                "reorder_level": [random.randint(10, 60) for _ in range(20)],
-                "unit_cost": [round(random.uniform(20, 600), 2) for _ in range(20)]
-            })
-            end_date = datetime.strptime("2025-07-13", "%Y-%m-%d")
-            start_date = end_date - pd.Timedelta(days=365)
-            crm_data = pd.DataFrame({
-                "customer_id": [f"C{100+i}" for i in range(20)],
-                "customer_name": [f"Customer {i}" for i in range(1, 21)],
-                "contact_date": [start_date + pd.Timedelta(days=random.randint(0, 365)) for _ in range(20)],
-                "interaction_type": [random.choice(["Inquiry", "Complaint", "Follow-up", "Feedback", "Service Request"]) for _ in range(20)],
-                "salesperson": [random.choice(self.df['salesperson'].dropna().unique()) for _ in range(20)],
-                "satisfaction_score": [round(random.uniform(1.0, 5.0), 1) for _ in range(20)]
-            })
-            states = ['California', 'Texas', 'New York', 'Florida', 'Illinois', 'Pennsylvania', 'Ohio', 'Michigan', 'Georgia', 'North Carolina']
-            demo_data = pd.DataFrame({
-                "customer_id": [f"C{100+i}" for i in range(20)],
-                "age_group": [random.choice(["18-25", "26-35", "36-45", "46-55", "55+"]) for _ in range(20)],
-                "region": [random.choice(states) for _ in range(20)],
-                "purchase_amount": [round(random.uniform(15000, 100000), 2) for _ in range(20)],
-                "preferred_make": [random.choice(self.df['car_make'].dropna().unique()) for _ in range(20)]
-            })
-            logging.info("Fake data generated successfully")
-            return hr_data, inventory_data, crm_data, demo_data, time_log_data
+            if df.empty:
+                return pd.DataFrame(columns=CUBE_DIMENSIONS + ['quarter'] + CUBE_MEASURES)
+            cube = df.groupby(CUBE_DIMENSIONS, observed=True, dropna=False, sort=False).agg(
+                sale_price=('sale_price', 'sum'),
+                commission_earned=('commission_earned', 'sum'),
+                sale_price_count=('sale_price', 'count'),
+                commission_earned_count=('commission_earned', 'count'),
+                transactions=('sale_price', 'size')
+            ).reset_index()
+            cube['quarter'] = pd.PeriodIndex(cube['month'], freq='M').asfreq('Q').astype(str)
+            return compact_frame(cube[CUBE_DIMENSIONS + ['quarter'] + CUBE_MEASURES], CUBE_SCHEMA)
         except Exception as e:
-            logging.error(f"Error generating fake data: {str(e)}")
-            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+            logging.error(f"Error building aggregate cube: {str(e)}")
+            return pd.DataFrame(columns=CUBE_DIMENSIONS + ['quarter'] + CUBE_MEASURES)
 
 # Initialize dashboard
 dashboard = AutomotiveDashboard()
 
-# Helper function to generate table HTML
-def generate_table_html(df, columns, formatters=None):
+# Request instrumentation: helpers decorated with timed_stage add their time (minus nested stages) to the
+# request's stage totals, which are sent in a Server-Timing header and aggregated for /metrics. Metrics are
+# kept per process, so with several workers each worker reports its own.
+SERVER_TIMING = os.environ.get('SERVER_TIMING', '1') == '1'
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# Helper function to time a helper as a request stage; outside a request it just calls through
+def timed_stage(stage):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not has_app_context() or 'stage_timings' not in g:
+                return func(*args, **kwargs)
+            timings, stack = g.stage_timings, g.stage_stack
+            started = time.perf_counter()
+            if stack:
+                parent = stack[-1]
+                timings[parent[0]] = timings.get(parent[0], 0.0) + started - parent[1]
+            frame = [stage, started]
+            stack.append(frame)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ended = time.perf_counter()
+                stack.pop()
+                timings[stage] = timings.get(stage, 0.0) + ended - frame[1]
+                if stack:
+                    stack[-1][1] = ended
+        return wrapper
+    return decorator
+
+class RequestMetrics:
+    # Per-route request counts, latency histograms, bytes out, stage time and section cache lookups,
+    # rendered in the Prometheus text format
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.requests = {}
+        self.latency = {}
+        self.bytes_out = {}
+        self.stages = {}
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def observe(self, route, method, status, seconds, size, stages, cache_hits, cache_misses):
+        with self.lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.setdefault(route, {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0})
+            histogram["counts"][bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram["sum"] += seconds
+            self.bytes_out[route] = self.bytes_out.get(route, 0) + size
+            for stage, elapsed in stages.items():
+                totals = self.stages.setdefault((route, stage), [0.0, 0])
+                totals[0] += elapsed
+                totals[1] += 1
+            for result, count in (('hit', cache_hits), ('miss', cache_misses)):
+                if count:
+                    self.cache[(route, result)] = self.cache.get((route, result), 0) + count
+
+    def render(self):
+        lines = []
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        with self.lock:
+            family('dashboard_requests_total', 'counter', 'Requests handled, by route, method and status.')
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f'dashboard_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+            family('dashboard_request_duration_seconds', 'histogram', 'Request latency until the last body byte.')
+            for route, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip([*self.buckets, '+Inf'], histogram["counts"]):
+                    cumulative += count
+                    lines.append(f'dashboard_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+                lines.append(f'dashboard_request_duration_seconds_sum{{route="{route}"}} {histogram["sum"]:.6f}')
+                lines.append(f'dashboard_request_duration_seconds_count{{route="{route}"}} {cumulative}')
+            family('dashboard_response_bytes_total', 'counter', 'Response body bytes sent (after compression).')
+            for route, size in sorted(self.bytes_out.items()):
+                lines.append(f'dashboard_response_bytes_total{{route="{route}"}} {size}')
+            family('dashboard_stage_duration_seconds', 'summary', 'Time spent per request stage, excluding nested stages.')
+            for (route, stage), (elapsed, count) in sorted(self.stages.items()):
+                lines.append(f'dashboard_stage_duration_seconds_sum{{route="{route}",stage="{stage}"}} {elapsed:.6f}')
+                lines.append(f'dashboard_stage_duration_seconds_count{{route="{route}",stage="{stage}"}} {count}')
+            family('dashboard_section_cache_total', 'counter', 'Chart cache lookups for page sections, by route and result.')
+            for (route, result), count in sorted(self.cache.items()):
+                lines.append(f'dashboard_section_cache_total{{route="{route}",result="{result}"}} {count}')
+        stats = chart_cache.stats()
+        family('dashboard_chart_cache_entries', 'gauge', 'Fragments held in the chart cache.')
+        lines.append(f"dashboard_chart_cache_entries {stats['entries']}")
+        family('dashboard_chart_cache_bytes', 'gauge', 'Size of the fragments held in the chart cache.')
+        lines.append(f"dashboard_chart_cache_bytes {stats['bytes']}")
+        family('dashboard_log_records_dropped_total', 'counter', 'Log records dropped because the log queue was full.')
+        lines.append(f"dashboard_log_records_dropped_total {log_handler.dropped}")
+        family('dashboard_dataset_rows', 'gauge', 'Rows in the current dataset version.')
+        lines.append(f'dashboard_dataset_rows{{table="sales"}} {len(dashboard.df)}')
+        lines.append(f'dashboard_dataset_rows{{table="cube"}} {len(dashboard.cube)}')
+        return "\n".join(lines) + "\n"
+
+request_metrics = RequestMetrics()
+
+class CountingStream:
+    # Streamed response body that counts the bytes sent and reports them once the server closes it
+    def __init__(self, chunks, on_close):
+        self.chunks = chunks
+        self.on_close = on_close
+        self.size = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.size += len(chunk.encode('utf-8')) if isinstance(chunk, str) else len(chunk)
+            yield chunk
+
+    def close(self):
+        if hasattr(self.chunks, 'close'):
+            self.chunks.close()
+        if self.on_close is not None:
+            on_close, self.on_close = self.on_close, None
+            on_close(self.size)
+
+# Helper function to format stage timings (seconds) as a Server-Timing header value
+def server_timing_header(stages, total, cache_hits, cache_misses):
+    entries = [f"{stage};dur={elapsed * 1000:.2f}" for stage, elapsed in stages.items()]
+    if cache_hits or cache_misses:
+        entries.append(f'cache;desc="{cache_hits} hit, {cache_misses} miss"')
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.stage_timings = {}
+    g.stage_stack = []
+    g.cache_hits = 0
+    g.cache_misses = 0
+
+# Registered before compress_response, so it runs after it and sees the bytes that go out
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' not in g:
+        return response
+    state = g._get_current_object()
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    method, status, path = request.method, response.status_code, request.path
+    if SERVER_TIMING:
+        # A streamed page's header can only cover the work done before its first byte
+        response.headers['Server-Timing'] = server_timing_header(
+            state.stage_timings, time.perf_counter() - state.request_started, state.cache_hits, state.cache_misses
+        )
+    # Filters are only read when the view already used the session, so other responses don't become Vary: Cookie
+    filters = {dim: values for dim, values in get_session_filters().items() if values} if session.accessed else None
+    def finish(size):
+        seconds = time.perf_counter() - state.request_started
+        request_metrics.observe(route, method, status, seconds, size,
+                                state.stage_timings, state.cache_hits, state.cache_misses)
+        if request_log.isEnabledFor(logging.INFO) and (
+                status >= 500 or seconds >= LOG_SLOW_SECONDS or random.random() < LOG_REQUEST_SAMPLE):
+            request_log.info("%s %s %s", method, path, status, extra={"fields": {
+                "route": route, "path": path, "method": method, "status": status,
+                "duration_ms": round(seconds * 1000, 2), "bytes": size,
+                "stages_ms": {stage: round(elapsed * 1000, 2) for stage, elapsed in state.stage_timings.items()},
+                "cache_hits": state.cache_hits, "cache_misses": state.cache_misses,
+                "filters": filters, "dataset_version": state.get('dataset_version')
+            }})
+    size = response.calculate_content_length()
+    if size is None:
+        response.response = CountingStream(response.response, finish)
+    else:
+        finish(size)
+    return response
+
+# On-demand profiling, off unless PROFILE_TOKEN is set (no hooks are registered then). A request sent with
+# "X-Profile: <token>" runs under cProfile, or under a stack sampler with "X-Profile-Mode: sample", and the
+# profile is stored in PROFILE_DIR under the id returned in X-Profile-Id. POST /debug/profiles samples all
+# requests of this worker for a window of traffic; GET /debug/profiles/<id> serves a stored profile.
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'dashboard-profiles')
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 50))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.005))
+PROFILE_MAX_WINDOW = 600
+PROFILE_ID_PATTERN = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{8}$')
+
+class StackSampler:
+    # Samples the Python stacks of a set of threads at a fixed interval and counts them as collapsed
+    # stacks ("outer;inner count" lines, as read by flamegraph.pl and speedscope). It needs the GIL to take
+    # a sample, so code that releases it is over-represented; cProfile mode gives exact call counts.
+    def __init__(self, threads, interval=PROFILE_SAMPLE_INTERVAL):
+        self.threads = threads
+        self.interval = interval
+        self.counts = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    stack = self.fold(frame)
+                    self.counts[stack] = self.counts.get(stack, 0) + 1
+
+    @staticmethod
+    def fold(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        return self
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+# cProfile hooks the interpreter, so one profiled request at a time per worker; the sampling window is shared
+_profile_lock = threading.Lock()
+_profile_window = {"id": None, "threads": set()}
+_profile_window_lock = threading.Lock()
+PROFILE_SORT_KEYS = {'cumulative', 'tottime', 'ncalls', 'name', 'filename'}
+
+# Helper function to check a profiling secret in constant time
+def profile_authorized(secret):
+    return bool(PROFILE_TOKEN) and hmac.compare_digest(secret or '', PROFILE_TOKEN)
+
+# Helper function to name a new profile; ids sort by creation time
+def new_profile_id():
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+# Helper function to store a profile file atomically, keeping the newest PROFILE_KEEP profiles
+def save_profile(profile_id, extension, write):
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{profile_id}.{extension}")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+        stored = sorted(name for name in os.listdir(PROFILE_DIR) if not name.endswith('.tmp'))
+        for name in stored[:max(len(stored) - PROFILE_KEEP, 0)]:
+            os.remove(os.path.join(PROFILE_DIR, name))
+        logging.info(f"Profile {profile_id} stored in {path}")
+    except Exception as e:
+        logging.error(f"Error storing profile {profile_id}: {str(e)}")
+
+# Helper function to write a text file, closing it before the caller moves it into place
+def write_text_file(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+# Helper function to stop a request's profiler and store what it recorded
+def finish_profile(profile_id, mode, profiler):
+    if mode == 'sample':
+        collapsed = profiler.stop().collapsed()
+        save_profile(profile_id, 'folded', lambda path: write_text_file(path, collapsed))
+    else:
+        profiler.disable()
+        _profile_lock.release()
+        save_profile(profile_id, 'prof', profiler.dump_stats)
+
+# Helper function to stop a sampling window and store its collapsed stacks
+def finish_profile_window(profile_id, sampler):
+    collapsed = sampler.stop().collapsed()
+    save_profile(profile_id, 'folded', lambda path: write_text_file(path, collapsed))
+    _profile_window["id"] = None
+
+def start_request_profile():
+    if _profile_window["id"] is not None:
+        _profile_window["threads"].add(threading.get_ident())
+    if not profile_authorized(request.headers.get('X-Profile')):
+        return
+    if request.headers.get('X-Profile-Mode') == 'sample':
+        g.profile = (new_profile_id(), 'sample', StackSampler({threading.get_ident()}).start())
+    elif _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        g.profile = (new_profile_id(), 'cprofile', profiler)
+        profiler.enable()
+    else:
+        g.profile_busy = True
+
+def finish_request_profile(response):
+    if g.pop('profile_busy', False):
+        response.headers['X-Profile-Status'] = 'busy'
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    response.headers['X-Profile-Id'] = profile[0]
+    if response.is_streamed:
+        # A streamed page is still being generated; stop once the server has sent the last chunk
+        response.call_on_close(lambda: finish_profile(*profile))
+    else:
+        finish_profile(*profile)
+    return response
+
+def end_request_profile(exc):
+    _profile_window["threads"].discard(threading.get_ident())
+    profile = g.pop('profile', None)
+    if profile is not None:
+        finish_profile(*profile)
+
+if PROFILE_TOKEN:
+    app.before_request(start_request_profile)
+    app.after_request(finish_request_profile)
+    app.teardown_request(end_request_profile)
+
+# Serve the plotly.js bundle once as a content-hashed static asset so chart fragments
+# only reference it instead of inlining several megabytes into every page
+PLOTLY_JS = get_plotlyjs().encode('utf-8')
+PLOTLY_JS_ETAG = hashlib.sha256(PLOTLY_JS).hexdigest()[:16]
+PLOTLY_JS_FILENAME = f"plotly-{get_plotlyjs_version()}.{PLOTLY_JS_ETAG}.min.js"
+PLOTLY_JS_URL = f"/assets/{PLOTLY_JS_FILENAME}"
+ASSET_MAX_AGE = 31536000
+_plotly_js_variants = {'identity': PLOTLY_JS}
+_plotly_js_lock = threading.Lock()
+
+# Helper function to get a (lazily precompressed) variant of the plotly bundle
+def get_plotly_js_variant(encoding):
+    variant = _plotly_js_variants.get(encoding)
+    if variant is None:
+        with _plotly_js_lock:
+            variant = _plotly_js_variants.get(encoding)
+            if variant is None:
+                if encoding == 'br':
+                    variant = brotli.compress(PLOTLY_JS, quality=9)
+                else:
+                    variant = gzip.compress(PLOTLY_JS, compresslevel=9, mtime=0)
+                _plotly_js_variants[encoding] = variant
+                logging.info(f"Precompressed plotly.js ({encoding}): {len(PLOTLY_JS):,} -> {len(variant):,} bytes")
+    return variant
+
+# Helper function to pick the best encoding the client accepts, honouring q-values (q=0 refuses an encoding);
+# br is preferred over gzip when both are equally acceptable
+def negotiate_encoding(accept_encodings):
+    return accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'], default='identity')
+
+# Chart fragment: an empty div that the shared plotly.js asset draws into
+CHART_DIV = '<div id="{id}" class="plotly-graph-div"></div><script>Plotly.newPlot("{id}", {data}, {layout}, {{"responsive": true}});</script>'
+
+# Helper function to render a figure (or an already encoded figure dict) as an HTML fragment
+# that relies on the shared plotly.js asset
+@timed_stage('chart_html')
+def render_chart(fig):
+    # The figure is serialized once: the div id is derived from that JSON so a re-rendered page is
+    # byte-identical (strong ETags rely on it), and the same JSON fills the div
+    fig = fig if isinstance(fig, dict) else fig.to_dict()
+    data = pio.json.to_json_plotly(fig.get("data", []))
+    layout = pio.json.to_json_plotly(fig.get("layout", {}))
+    div_id = "chart-" + hashlib.sha256(f"{data}\n{layout}".encode('utf-8')).hexdigest()[:16]
+    return CHART_DIV.format(id=div_id, data=data, layout=layout)
+
+# Table markup shared by every rendered table
+TABLE_OPEN = "<table style='width:100%;border-collapse:collapse;border:1px solid #4A4A4A;color:#D3D3D3;background-color:#2A2A2A;font-family:Arial,sans-serif;font-size:12px;'>"
+TABLE_HEADER_CELL = "<th style='padding:5px;border:1px solid #4A4A4A;'>"
+TABLE_CELL = "<td style='padding:5px;border:1px solid #4A4A4A;'>"
+TABLE_MAX_ROWS = int(os.environ.get('TABLE_MAX_ROWS', 1000))
+
+# Helper function to format a whole column at once. Named formats produce HTML-safe text, so they skip the
+# per-cell escaping; 'int' and 'date' are converted by pandas in one pass, while 'currency' and 'percent'
+# still call str.format once per cell (tables are paged to TABLE_MAX_ROWS rows)
+def format_column(values, formatter=None):
+    if formatter == 'currency':
+        return values.map('₹{:,.2f}'.format).tolist()
+    if formatter == 'percent':
+        return values.map('{:.2f}%'.format).tolist()
+    if formatter == 'int':
+        return values.astype('int64').astype(str).tolist()
+    if formatter == 'date':
+        return values.dt.strftime('%Y-%m-%d').tolist()
+    if callable(formatter):
+        return [html_escape(str(v)) for v in values.map(formatter)]
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(str).tolist()
+    return [html_escape(str(v)) for v in values.tolist()]
+
+# Helper function to build a table section spec of formatted (HTML-safe) cells; formatters map columns to
+# a named format ('currency', 'percent', 'int', 'date') or a callable, and rows are paged with offset/limit
+@timed_stage('table')
+def table_spec(df, columns, formatters=None, offset=0, limit=TABLE_MAX_ROWS):
     if df.empty:
-        return "<p style='color:white'>No data available</p>"
+        return {"message": "No data available"}
     formatters = formatters or {}
-    html = "<table style='width:100%;border-collapse:collapse;border:1px solid #4A4A4A;color:#D3D3D3;background-color:#2A2A2A;font-family:Arial,sans-serif;font-size:12px;'>"
-    html += "<tr style='background-color:#3A3A3A;'>" + "".join(f"<th style='padding:5px;border:1px solid #4A4A4A;'>{col}</th>" for col in columns) + "</tr>"
-    for _, row in df.iterrows():
-        html += "<tr>"
-        for col in columns:
-            value = row[col]
-            formatter = formatters.get(col, lambda x: str(x))
-            html += f"<td style='padding:5px;border:1px solid #4A4A4A;'>{formatter(value)}</td>"
-        html += "</tr>"
-    html += "</table>"
-    return html
-
-# Helper function to get filtered df
-def get_filtered_df():
-    df = dashboard.df.copy()
-    salesperson = session.get('salesperson', 'All')
-    car_make = session.get('car_make', 'All')
-    car_model = session.get('car_model', 'All')
-    car_year = session.get('car_year', 'All')
-    if salesperson != 'All':
-        df = df[df['salesperson'] == salesperson]
-    if car_make != 'All':
-        df = df[df['car_make'] == car_make]
-    if car_model != 'All':
-        df = df[df['car_model'] == car_model]
-    if car_year != 'All':
-        df = df[df['car_year'].astype(str) == car_year]
-    return df
+    total = len(df)
+    if limit is not None:
+        offset = min(offset, (total - 1) // limit * limit)
+    page = df.iloc[offset:offset + limit] if limit is not None else df.iloc[offset:]
+    cells = [format_column(page[col], formatters.get(col)) for col in columns]
+    return {"table": {"columns": [str(col) for col in columns], "rows": list(zip(*cells)), "offset": offset, "total": total}}
+
+# Helper function to render a table spec with a single join
+@timed_stage('table')
+def render_table(table):
+    cell_sep = "</td>" + TABLE_CELL
+    parts = [TABLE_OPEN, "<tr style='background-color:#3A3A3A;'>"]
+    parts.extend(f"{TABLE_HEADER_CELL}{html_escape(col)}</th>" for col in table["columns"])
+    parts.append("</tr>")
+    parts.extend(f"<tr>{TABLE_CELL}{cell_sep.join(row)}</td></tr>" for row in table["rows"])
+    parts.append("</table>")
+    offset, shown, total = table["offset"], len(table["rows"]), table["total"]
+    if offset > 0 or offset + shown < total:
+        parts.append(f"<p class='footer'>Showing rows {offset + 1:,}-{offset + shown:,} of {total:,}</p>")
+    return "".join(parts)
+
+# Helper function to normalize a filter value ('All', a single value or a list) into a list of selected values
+def normalize_filter_values(value):
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return [str(v) for v in values if v not in (None, '', 'All')]
+
+# Helper function to read the filters from any mapping with getlist() (form or query string)
+def parse_filters(values):
+    return {dim: normalize_filter_values(values.getlist(dim)) for dim in FILTER_DIMENSIONS}
+
+# Helper function to get the active filters from the session
+def get_session_filters():
+    return {dim: normalize_filter_values(session.get(dim, 'All')) for dim in FILTER_DIMENSIONS}
+
+# Helper function to store the posted filter form in the session (multi-select values are kept as lists)
+def store_filter_form():
+    for dim, values in parse_filters(request.form).items():
+        session[dim] = values if len(values) > 1 else (values[0] if values else 'All')
+    session['metric'] = request.form.get('metric', 'sale_price')
+    logging.debug("Filters applied successfully")
+
+# Rows per chunk when streaming exports
+CSV_CHUNK_ROWS = int(os.environ.get('CSV_CHUNK_ROWS', 50000))
+
+# Helper function to get a zero-copy view of the filtered sales rows
+@timed_stage('filter')
+def get_filtered_view(filters=None):
+    rows = dashboard.sales_index.select(get_session_filters() if filters is None else filters)
+    return DatasetView(dashboard.df, rows)
+
+# Helper function to get the filtered aggregate cube
+@timed_stage('filter')
+def get_filtered_cube(filters=None):
+    rows = dashboard.cube_index.select(get_session_filters() if filters is None else filters)
+    if rows is None:
+        return dashboard.cube
+    return dashboard.cube.take(rows)
+
+# Helper function to roll the (filtered) cube up to the given dimensions
+@timed_stage('aggregate')
+def rollup(cube, by, columns=CUBE_MEASURES):
+    return cube.groupby(by, observed=True)[columns].sum().reset_index()
 
 # Helper function to calculate KPIs
-def calculate_kpis(filtered_df):
-    if filtered_df.empty:
+@timed_stage('aggregate')
+def calculate_kpis(filtered_cube):
+    if filtered_cube.empty:
         return "₹0", "₹0", "₹0", "0"
-    total_sales = f"₹{filtered_df['sale_price'].sum():,.0f}"
-    total_comm = f"₹{filtered_df['commission_earned'].sum():,.0f}"
-    avg_price = f"₹{filtered_df['sale_price'].mean():,.0f}"
-    trans_count = f"{filtered_df.shape[0]:,}"
+    total_sales = f"₹{filtered_cube['sale_price'].sum():,.0f}"
+    total_comm = f"₹{filtered_cube['commission_earned'].sum():,.0f}"
+    avg_price = f"₹{filtered_cube['sale_price'].sum() / filtered_cube['sale_price_count'].sum():,.0f}"
+    trans_count = f"{int(filtered_cube['transactions'].sum()):,}"
     return total_sales, total_comm, avg_price, trans_count
 
 def get_common_html_parts():
-    salespeople = ['All'] + sorted(dashboard.df['salesperson'].dropna().unique().tolist())
-    car_makes = ['All'] + sorted(dashboard.df['car_make'].dropna().unique().tolist())
-    car_years = ['All'] + sorted(dashboard.df['car_year'].dropna().astype(str).unique().tolist())
-    metrics = ["sale_price", "commission_earned"]
-
-    salesperson_options = ''.join(f'<option value="{s}" {"selected" if s == session.get("salesperson", "All") else ""}>{s}</option>' for s in salespeople)
-    car_make_options = ''.join(f'<option value="{c}" {"selected" if c == session.get("car_make", "All") else ""}>{c}</option>' for c in car_makes)
-    car_year_options = ''.join(f'<option value="{y}" {"selected" if y == session.get("car_year", "All") else ""}>{y}</option>' for y in car_years)
+    dimensions = dashboard.dimensions
+    metrics = METRICS
+    selected = get_session_filters()
+
+    salesperson_options = dimensions.options('salesperson', selected['salesperson'])
+    car_make_options = dimensions.options('car_make', selected['car_make'])
+    car_year_options = dimensions.options('car_year', selected['car_year'])
     metric_options = ''.join(f'<option value="{m}" {"selected" if m == session.get("metric", "sale_price") else ""}>{m}</option>' for m in metrics)
 
-    car_models_json = json.dumps(dashboard.car_models)
+    car_models_json = dimensions.models_json
 
     return salesperson_options, car_make_options, car_year_options, metric_options, car_models_json
 
-@app.route('/health')
-def health():
-    return {"status": "OK"}, 200
-
-@app.route('/', methods=['GET', 'POST'])
-def index():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for KPI Trend</p>"
+# Chart cache for rendered fragments
+CHART_CACHE_MAX_BYTES = int(os.environ.get('CHART_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+class ChartCache:
+    # Bounded LRU of rendered chart/table fragments, evicted by total size in bytes
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self.lock:
+            html = self.entries.get(key)
+            if html is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+        html = render()
+        size = len(html.encode('utf-8'))
+        if size > self.max_bytes:
+            return html
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = html
+                self.size += size
+                while self.size > self.max_bytes:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.size -= len(evicted.encode('utf-8'))
+        return html
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+chart_cache = ChartCache(CHART_CACHE_MAX_BYTES)
+
+@app.before_request
+def pin_dataset_version():
+    # Cache keys and ETags use the version seen when the request started; data is published before its
+    # version (see AutomotiveDashboard.install), so a request never files old data under a new version
+    dashboard.sync_snapshot()
+    g.dataset_version = dashboard.version
+
+# Helper function to serve a fragment from the chart cache, keyed by route, section, dataset version, filters and metric
+def cached_section(route, section, render, metric=None, filtered=True, filters=None):
+    if filtered:
+        filters = tuple((dim, tuple(values)) for dim, values in (filters or get_session_filters()).items())
     else:
-        kpi_trend = filtered_df.groupby('month')[['sale_price', 'commission_earned']].sum().reset_index()
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=kpi_trend['month'], y=kpi_trend['sale_price'], name='sale_price', line=dict(color='#A9A9A9')))
-        fig.add_trace(go.Scatter(x=kpi_trend['month'], y=kpi_trend['commission_earned'], name='Commission', line=dict(color='#808080')))
-        fig.update_layout(
-            xaxis_title='Month', yaxis_title='Amount (₹)', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        chart_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
-
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
-
-@app.route('/kpi', methods=['GET', 'POST'])
-def kpi():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for KPI Trend</p>"
+        filters = None
+    key = (route, section, g.dataset_version, filters, metric)
+    missed = []
+    def render_miss():
+        missed.append(True)
+        return render()
+    html = chart_cache.get_or_render(key, render_miss)
+    if missed:
+        g.cache_misses += 1
     else:
-        kpi_trend = filtered_df.groupby('month')[['sale_price', 'commission_earned']].sum().reset_index()
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=kpi_trend['month'], y=kpi_trend['sale_price'], name='sale_price', line=dict(color='#A9A9A9')))
-        fig.add_trace(go.Scatter(x=kpi_trend['month'], y=kpi_trend['commission_earned'], name='Commission', line=dict(color='#808080')))
-        fig.update_layout(
-            xaxis_title='Month', yaxis_title='Amount (₹)', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        chart_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
-
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>KPI Trend - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    <h2>KPI Trend</h2>
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
+        g.cache_hits += 1
     return html
 
-@app.route('/3d', methods=['GET', 'POST'])
-def three_d():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for 3D Sales</p>"
-    else:
-        scatter_data = filtered_df.sample(n=min(100, len(filtered_df)), random_state=1)
-        fig = go.Figure(data=[
-            go.Scatter3d(
-                x=scatter_data['commission_earned'], y=scatter_data['sale_price'], z=scatter_data['car_year'],
-                mode='markers', marker=dict(size=5, color=scatter_data['car_year'], colorscale='Greys', showscale=True)
-            )
-        ])
-        fig.update_layout(
-            scene=dict(xaxis_title='Commission Earned (₹)', yaxis_title='Sale Price (₹)', zaxis_title='Car Year'),
-            template='plotly_dark', plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        chart_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
+# Layout shared by every chart; section specs only carry what differs (axis titles, bar mode, 3D scene)
+CHART_LAYOUT = dict(template='plotly_dark', plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400)
+PIE_COLORS = ['#D3D3D3', '#A9A9A9', '#808080', '#606060', '#4A4A4A', '#3A3A3A', '#2A2A2A', '#1C1C1C']
+
+# Helper function to build the axis part of a chart layout
+def axis_layout(x_title, y_title, tickangle=45):
+    xaxis = {"title": {"text": x_title}}
+    if tickangle is not None:
+        xaxis["tickangle"] = tickangle
+    return {"xaxis": xaxis, "yaxis": {"title": {"text": y_title}}}
+
+# Helper function to wrap plotly traces and layout overrides into a chart section spec
+def chart_spec(data, layout=None):
+    return {"chart": {"data": data, "layout": layout or {}}}
+
+# Chart payload encoding: 'typed' ships numeric arrays as base64 typed arrays (plotly.js >= 2.28 decodes
+# them natively), 'json' keeps plain number lists. Floats are rounded to CHART_DECIMALS either way.
+CHART_ENCODING = os.environ.get('CHART_ENCODING', 'typed')
+CHART_DECIMALS = int(os.environ.get('CHART_DECIMALS', 2))
+TYPED_ARRAY_MIN_SIZE = 16
+TYPED_INT_DTYPES = ['i1', 'i2', 'i4']
+CATEGORY_KEYS = ['x', 'y', 'labels']
+CHART_TEMPLATE = pio.templates[CHART_LAYOUT['template']].to_plotly_json()
+
+# Helper function to pack a numpy array into a plotly typed array spec
+def typed_array(values, dtype):
+    spec = {"dtype": dtype, "bdata": base64.b64encode(values.astype(f"<{dtype}").tobytes()).decode('ascii')}
+    if values.ndim > 1:
+        spec["shape"] = ",".join(str(size) for size in values.shape)
+    return spec
+
+# Helper function to encode one data array: the narrowest integer type when the values are whole numbers,
+# float32 when it keeps them within half a unit of the last shown decimal, float64 otherwise
+def encode_array(values, decimals=CHART_DECIMALS):
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iuf':
+        return values.tolist()
+    if values.dtype.kind == 'f':
+        values = values.astype(np.float64).round(decimals)
+    if CHART_ENCODING != 'typed' or values.size < TYPED_ARRAY_MIN_SIZE:
+        return values.tolist()
+    if values.dtype.kind in 'iu' or (np.isfinite(values).all() and (values == np.trunc(values)).all()):
+        low, high = values.min(), values.max()
+        for dtype in TYPED_INT_DTYPES:
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                return typed_array(values, dtype)
+    narrowed = values.astype(np.float32)
+    if np.allclose(narrowed, values, rtol=0, atol=0.5 * 10.0 ** -decimals, equal_nan=True):
+        return typed_array(narrowed, 'f4')
+    return typed_array(values, 'f8')
+
+# Helper function to encode every array inside a trace (including nested ones such as marker.color)
+def encode_value(value):
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+        return encode_array(value)
+    return value
+
+# Helper function to replace repeated category strings across a chart's traces with codes into one
+# shared list; only used for the API payload, whose client expands the codes before plotting
+def dedup_categories(data):
+    arrays = [
+        (i, key) for i, trace in enumerate(data) for key in CATEGORY_KEYS
+        if isinstance(trace.get(key), list) and trace[key] and all(isinstance(item, str) for item in trace[key])
+    ]
+    if sum(len(data[i][key]) for i, key in arrays) == len({item for i, key in arrays for item in data[i][key]}):
+        return data, None
+    categories = {}
+    data = list(data)
+    for i, key in arrays:
+        data[i] = {**data[i], key: {"codes": [categories.setdefault(item, len(categories)) for item in data[i][key]]}}
+    return data, list(categories)
+
+# Helper function to encode the arrays of a chart spec for serialization
+def encode_chart(chart, dedup=False):
+    data = [encode_value(trace) for trace in chart["data"]]
+    encoded = {"data": data, "layout": chart["layout"]}
+    if dedup:
+        encoded["data"], categories = dedup_categories(data)
+        if categories:
+            encoded["categories"] = categories
+    return encoded
+
+# Helper function to build an encoded plotly figure dict from a chart spec
+@timed_stage('figure')
+def figure_from_spec(chart):
+    return {
+        "data": encode_chart(chart)["data"],
+        "layout": {**CHART_LAYOUT, "template": CHART_TEMPLATE, **chart["layout"]}
+    }
+
+# Downsampling budgets: line charts keep about one point per horizontal pixel (LTTB), the 3D scatter
+# keeps at most SCATTER_POINT_BUDGET points drawn proportionally from a year x price x commission grid
+CHART_PIXEL_WIDTH = int(os.environ.get('CHART_PIXEL_WIDTH', 1200))
+SCATTER_POINT_BUDGET = int(os.environ.get('SCATTER_POINT_BUDGET', 5000))
+SCATTER_STRATA_BINS = 8
+SCATTER_SAMPLE_SEED = 1
+# Quantile bin edges are estimated on an evenly strided subset of at most this many rows
+SCATTER_QUANTILE_ROWS = 200000
+
+# Helper function to pick the positions of at most `threshold` points with Largest-Triangle-Three-Buckets,
+# which keeps the peaks and troughs a line chart would show
+def lttb(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    bounds = np.append((np.arange(threshold - 1) * (n - 2)) // (threshold - 2) + 1, n)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end, next_end = bounds[i], bounds[i + 1], bounds[i + 2]
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+# Helper function to downsample several series that share one x axis: the union of each series' LTTB picks
+@timed_stage('downsample')
+def downsample_series(x, *series, budget=CHART_PIXEL_WIDTH):
+    if len(x) <= budget:
+        return slice(None)
+    per_series = max(budget // len(series), 3)
+    return np.unique(np.concatenate([lttb(x, y, per_series) for y in series]))
+
+# Helper function to draw a density-preserving sample for the 3D scatter: rows are bucketed by car year and
+# price / commission quantile bins, every occupied bucket keeps its share of the budget (at least one point,
+# so sparse corners stay visible) and the pick inside a bucket is random but seeded
+@timed_stage('downsample')
+def stratified_sample(filtered_view, budget=SCATTER_POINT_BUDGET, random_state=SCATTER_SAMPLE_SEED):
+    n = len(filtered_view)
+    if n <= budget:
+        return filtered_view
+    cell, years = pd.factorize(filtered_view.column('car_year'))
+    # Keep the grid to at most a quarter of the budget so the one-point minimum cannot swamp it
+    bins = int(np.clip(np.sqrt(budget / (4 * max(len(years), 1))), 1, SCATTER_STRATA_BINS))
+    step = max(n // SCATTER_QUANTILE_ROWS, 1)
+    for name in ['sale_price', 'commission_earned']:
+        values = filtered_view.column(name).to_numpy()
+        edges = np.unique(np.nanquantile(values[::step], np.linspace(0, 1, bins + 1)[1:-1]))
+        cell = cell * bins + np.searchsorted(edges, values)
+    counts = np.bincount(cell)
+    quota = np.maximum(counts * budget // n, counts > 0)
+    # Rows are shuffled once and then grouped by bucket with a stable sort, so each bucket lists its rows in
+    # random order (bucket ids are narrowed first so numpy radix-sorts them); the first quota rows of each
+    # bucket are kept
+    shuffled = np.random.default_rng(random_state).permutation(n)
+    shuffled_cells = cell[shuffled].astype(narrowest_code_dtype(counts))
+    grouped = np.argsort(shuffled_cells, kind='stable')
+    grouped_cells = shuffled_cells[grouped]
+    keep = np.arange(n) - (np.cumsum(counts) - counts)[grouped_cells] < quota[grouped_cells]
+    mask = np.zeros(n, dtype=bool)
+    mask[shuffled[grouped[keep]]] = True
+    return filtered_view.where(mask)
+
+# Helper function to render a section spec (chart, table or message) as an HTML fragment
+def render_section(spec):
+    if "chart" in spec:
+        return render_chart(figure_from_spec(spec["chart"]))
+    if "table" in spec:
+        return render_table(spec["table"])
+    return f"<p style='color:white'>{spec['message']}</p>"
+
+# Spec for the monthly KPI trend
+def kpi_trend_spec(filtered_cube):
+    kpi_trend = rollup(filtered_cube, 'month', ['sale_price', 'commission_earned'])
+    kpi_trend = kpi_trend.iloc[downsample_series(np.arange(len(kpi_trend)), kpi_trend['sale_price'], kpi_trend['commission_earned'])]
+    months = kpi_trend['month'].tolist()
+    return chart_spec([
+        {"type": "scatter", "x": months, "y": kpi_trend['sale_price'].to_numpy(), "name": 'sale_price', "line": {"color": '#A9A9A9'}},
+        {"type": "scatter", "x": months, "y": kpi_trend['commission_earned'].to_numpy(), "name": 'Commission', "line": {"color": '#808080'}}
+    ], axis_layout('Month', 'Amount (₹)'))
+
+# Spec for the 3D commission / price / year scatter
+def scatter3d_spec(filtered_view):
+    scatter_data = stratified_sample(filtered_view).to_frame(
+        ['commission_earned', 'sale_price', 'car_year']
+    )
+    car_years = scatter_data['car_year'].to_numpy()
+    return chart_spec([{
+        "type": "scatter3d", "x": scatter_data['commission_earned'].to_numpy(), "y": scatter_data['sale_price'].to_numpy(), "z": car_years,
+        "mode": 'markers', "marker": {"size": 5, "color": car_years, "colorscale": 'Greys', "showscale": True}
+    }], {"scene": {
+        "xaxis": {"title": {"text": 'Commission Earned (₹)'}},
+        "yaxis": {"title": {"text": 'Sale Price (₹)'}},
+        "zaxis": {"title": {"text": 'Car Year'}}
+    }})
+
+# Spec for the salesperson x car make heatmap
+def heatmap_spec(filtered_cube, selected_metric):
+    heatmap_data = filtered_cube.pivot_table(
+        values=selected_metric, index='salesperson', columns='car_make', aggfunc='sum', fill_value=0, observed=True
+    )
+    return chart_spec([{
+        "type": "heatmap", "z": heatmap_data.to_numpy(), "x": heatmap_data.columns.tolist(),
+        "y": heatmap_data.index.tolist(), "colorscale": 'Greys'
+    }], axis_layout('Car Make', 'Salesperson'))
+
+# Spec for the top 10 salespeople
+def top_performers_spec(filtered_cube, selected_metric):
+    top_salespeople = rollup(filtered_cube, 'salesperson', [selected_metric]).nlargest(10, selected_metric)
+    return chart_spec([{
+        "type": "bar", "x": top_salespeople['salesperson'].tolist(), "y": top_salespeople[selected_metric].to_numpy(),
+        "marker": {"color": '#A9A9A9'}
+    }], axis_layout('Salesperson', f"{selected_metric} (₹)"))
+
+# Spec for the sales share pie of the top 10 makes or models
+def vehicle_pie_spec(filtered_cube, dimension):
+    vehicle_metric = rollup(filtered_cube, dimension, ['sale_price']).nlargest(10, 'sale_price')
+    return chart_spec([{
+        "type": "pie", "labels": vehicle_metric[dimension].tolist(), "values": vehicle_metric['sale_price'].to_numpy(),
+        "marker": {"colors": PIE_COLORS}
+    }])
+
+# Spec for the make / model comparison table
+def model_table_spec(filtered_cube, offset=0):
+    model_sums = rollup(filtered_cube, ['car_make', 'car_model'])
+    model_comparison = pd.DataFrame({
+        'car_make': model_sums['car_make'],
+        'car_model': model_sums['car_model'],
+        'avg_sale_price': model_sums['sale_price'] / model_sums['sale_price_count'],
+        'total_sales': model_sums['sale_price'],
+        'transaction_count': model_sums['sale_price_count'],
+        'avg_commission': model_sums['commission_earned'] / model_sums['commission_earned_count']
+    }).round(2)
+    return table_spec(
+        model_comparison,
+        ['car_make', 'car_model', 'avg_sale_price', 'total_sales', 'transaction_count'],
+        {
+            'avg_sale_price': 'currency',
+            'total_sales': 'currency',
+            'transaction_count': 'int'
+        },
+        offset=offset
+    )
 
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
+# Spec for the quarterly trend
+def quarter_trend_spec(filtered_cube):
+    trend_df = rollup(filtered_cube, 'quarter', ['sale_price', 'commission_earned'])
+    trend_df = trend_df.iloc[downsample_series(np.arange(len(trend_df)), trend_df['sale_price'], trend_df['commission_earned'])]
+    quarters = trend_df['quarter'].tolist()
+    return chart_spec([
+        {"type": "scatter", "x": quarters, "y": trend_df['sale_price'].to_numpy(), "name": 'sale_price', "line": {"color": '#A9A9A9'}},
+        {"type": "scatter", "x": quarters, "y": trend_df['commission_earned'].to_numpy(), "name": 'Commission', "line": {"color": '#808080'}}
+    ], axis_layout('Quarter', 'Amount (₹)'))
+
+# Spec for the quarter-over-quarter % change table
+def qoq_table_spec(filtered_cube):
+    trend_df = rollup(filtered_cube, 'quarter', ['sale_price', 'commission_earned'])
+    trend_df['sale_price_qoq_percent'] = trend_df['sale_price'].pct_change().fillna(0) * 100
+    trend_df['commission_qoq_percent'] = trend_df['commission_earned'].pct_change().fillna(0) * 100
+    return table_spec(
+        trend_df,
+        ['quarter', 'sale_price_qoq_percent', 'commission_qoq_percent'],
+        {
+            'sale_price_qoq_percent': 'percent',
+            'commission_qoq_percent': 'percent'
+        }
+    )
 
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>3D Sales - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    <h2>3D Sales</h2>
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+# Spec for the monthly grouped bars
+def monthly_trend_spec(filtered_cube):
+    monthly_trend = rollup(filtered_cube, 'month', ['sale_price', 'commission_earned'])
+    months = monthly_trend['month'].tolist()
+    return chart_spec([
+        {"type": "bar", "x": months, "y": monthly_trend['sale_price'].to_numpy(), "name": 'sale_price', "marker": {"color": '#A9A9A9'}},
+        {"type": "bar", "x": months, "y": monthly_trend['commission_earned'].to_numpy(), "name": 'Commission', "marker": {"color": '#808080'}}
+    ], {**axis_layout('Month', 'Amount (₹)'), "barmode": 'group'})
+
+# Spec for the employee information & salary table
+def hr_table_spec():
+    return table_spec(
+        dashboard.hr_data,
+        dashboard.hr_data.columns,
+        {
+            'salary_usd': 'currency',
+            'join_date': 'date'
+        }
+    )
 
-@app.route('/heatmap', methods=['GET', 'POST'])
-def heatmap():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-    selected_metric = session.get('metric', 'sale_price')
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for Heatmap</p>"
-    else:
-        heatmap_data = filtered_df.pivot_table(
-            values=selected_metric, index='salesperson', columns='car_make', aggfunc='sum', fill_value=0
-        )
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data.values, x=heatmap_data.columns, y=heatmap_data.index, colorscale='Greys'
-        ))
-        fig.update_layout(
-            xaxis_title='Car Make', yaxis_title='Salesperson', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        chart_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
+# Spec for the performance score distribution
+def performance_spec():
+    if dashboard.hr_data.empty:
+        return {"message": "No data available for Performance"}
+    return chart_spec([{
+        "type": "histogram", "x": dashboard.hr_data['performance_score'].to_numpy(), "nbinsx": 5, "marker": {"color": '#A9A9A9'}
+    }], axis_layout('Performance Score', 'Count', tickangle=None))
+
+# Spec for the employee time log table
+def time_log_table_spec():
+    return table_spec(
+        dashboard.time_log_data,
+        dashboard.time_log_data.columns,
+        {'date': 'date'}
+    )
 
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
+# Spec for total logged hours per employee
+def hours_spec():
+    if dashboard.hr_data.empty:
+        return {"message": "No data available for Hours"}
+    total_hours = dashboard.time_log_data.groupby('employee_id', observed=True)['total_hours'].sum().reset_index()
+    return chart_spec([{
+        "type": "bar", "x": total_hours['employee_id'].tolist(), "y": total_hours['total_hours'].to_numpy(), "marker": {"color": '#A9A9A9'}
+    }], axis_layout('Employee ID', 'Total Hours'))
+
+# Spec for the parts inventory table
+def inventory_table_spec():
+    return table_spec(
+        dashboard.inventory_data,
+        dashboard.inventory_data.columns,
+        {'unit_cost': 'currency'}
+    )
 
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Heatmap - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    <h2>Heatmap</h2>
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+# Spec for the low stock alert
+def low_stock_spec():
+    if dashboard.inventory_data.empty:
+        return {"message": "No data available for Inventory"}
+    low_stock = dashboard.inventory_data[dashboard.inventory_data['stock_level'] < dashboard.inventory_data['reorder_level']]
+    if low_stock.empty:
+        return {"message": "No low stock items"}
+    return chart_spec([{
+        "type": "bar", "x": low_stock['part_name'].tolist(), "y": low_stock['stock_level'].to_numpy(), "marker": {"color": '#A9A9A9'}
+    }], axis_layout('Part Name', 'Stock Level'))
+
+# Spec for the CRM interactions table
+def crm_table_spec():
+    return table_spec(
+        dashboard.crm_data,
+        dashboard.crm_data.columns,
+        {'contact_date': 'date'}
+    )
 
-@app.route('/top', methods=['GET', 'POST'])
-def top():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-    selected_metric = session.get('metric', 'sale_price')
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for Top Performers</p>"
-    else:
-        top_salespeople = filtered_df.groupby('salesperson')[selected_metric].sum().nlargest(10).reset_index()
-        fig = go.Figure(data=[go.Bar(x=top_salespeople['salesperson'], y=top_salespeople[selected_metric], marker_color='#A9A9A9')])
-        fig.update_layout(
-            xaxis_title='Salesperson', yaxis_title=f"{selected_metric} (₹)", template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        chart_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
+# Spec for satisfaction over time
+def satisfaction_time_spec():
+    if dashboard.crm_data.empty:
+        return {"message": "No data available for Satisfaction Over Time"}
+    line_chart_data = dashboard.crm_data.groupby('contact_date')['satisfaction_score'].mean().reset_index()
+    line_chart_data = line_chart_data.iloc[downsample_series(
+        line_chart_data['contact_date'].to_numpy(dtype='datetime64[ns]').astype(np.int64), line_chart_data['satisfaction_score']
+    )]
+    return chart_spec([{
+        "type": "scatter", "x": line_chart_data['contact_date'].dt.strftime('%Y-%m-%d').tolist(),
+        "y": line_chart_data['satisfaction_score'].to_numpy(), "mode": 'lines+markers', "line": {"color": '#A9A9A9'}
+    }], axis_layout('Contact Date', 'Satisfaction Score'))
+
+# Spec for satisfaction by interaction type
+def satisfaction_type_spec():
+    if dashboard.crm_data.empty:
+        return {"message": "No data available for Satisfaction by Type"}
+    scores = dashboard.crm_data.groupby('interaction_type', observed=True, sort=False)['satisfaction_score']
+    return chart_spec(
+        [{"type": "box", "y": group.to_numpy(), "name": str(itype)} for itype, group in scores],
+        axis_layout('Interaction Type', 'Satisfaction Score')
+    )
 
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
+# Spec for the customer demographics table
+def demo_table_spec():
+    return table_spec(
+        dashboard.demo_data,
+        dashboard.demo_data.columns,
+        {'purchase_amount': 'currency'}
+    )
 
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Top Performers - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    <h2>Top Performers</h2>
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+# Spec for the age group distribution
+def age_spec():
+    if dashboard.demo_data.empty:
+        return {"message": "No data available for Age Distribution"}
+    age_counts = dashboard.demo_data['age_group'].value_counts()
+    age_counts = age_counts[age_counts > 0]
+    return chart_spec([{
+        "type": "bar", "x": age_counts.index.astype(str).tolist(), "y": age_counts.to_numpy(), "marker": {"color": '#A9A9A9'}
+    }], axis_layout('Age Group', 'Count'))
+
+# Spec for purchase amount by region
+def region_spec():
+    if dashboard.demo_data.empty:
+        return {"message": "No data available for Purchase Amount"}
+    amounts = dashboard.demo_data.groupby('region', observed=True, sort=False)['purchase_amount']
+    return chart_spec(
+        [{"type": "box", "y": group.to_numpy(), "name": str(region)} for region, group in amounts],
+        axis_layout('Region', 'Purchase Amount (₹)')
+    )
 
-@app.route('/vehicle', methods=['GET', 'POST'])
-def vehicle():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for Vehicle Sales</p>"
-    else:
-        car_make_metric = filtered_df.groupby('car_make')['sale_price'].sum().nlargest(10).reset_index()
-        fig = go.Figure(data=go.Pie(
-            labels=car_make_metric['car_make'], values=car_make_metric['sale_price'],
-            marker_colors=['#D3D3D3', '#A9A9A9', '#808080', '#606060', '#4A4A4A', '#3A3A3A', '#2A2A2A', '#1C1C1C']
-        ))
-        fig.update_layout(template='plotly_dark', plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400)
-        make_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
+# Sections of every dashboard view as (id, title, spec builder); builders receive the request context
+# with the resolved filters, metric and filtered cube. Sales views share one "no data" message. Both the
+# server-rendered pages and /api/v1 are built from this registry: a page shows its sections in order under
+# the view title, each with its own heading ("section_heading", h3 by default) unless it repeats the view
+# title; "columns" puts the sections side by side.
+VIEWS = {
+    'kpi': {"title": "KPI Trend", "sales": True, "sections": [
+        ('trend', 'KPI Trend', lambda ctx: kpi_trend_spec(ctx['cube']))
+    ]},
+    '3d': {"title": "3D Sales", "sales": True, "sections": [
+        ('scatter', '3D Sales', lambda ctx: scatter3d_spec(get_filtered_view(ctx['filters'])))
+    ]},
+    'heatmap': {"title": "Heatmap", "sales": True, "metric": True, "sections": [
+        ('heatmap', 'Heatmap', lambda ctx: heatmap_spec(ctx['cube'], ctx['metric']))
+    ]},
+    'top': {"title": "Top Performers", "sales": True, "metric": True, "sections": [
+        ('salespeople', 'Top Performers', lambda ctx: top_performers_spec(ctx['cube'], ctx['metric']))
+    ]},
+    'vehicle': {"title": "Vehicle Sales", "sales": True, "columns": True, "sections": [
+        ('make', 'Car Make', lambda ctx: vehicle_pie_spec(ctx['cube'], 'car_make')),
+        ('model', 'Car Model', lambda ctx: vehicle_pie_spec(ctx['cube'], 'car_model'))
+    ]},
+    'model': {"title": "Model Comparison", "sales": True, "paged": True, "sections": [
+        ('comparison', 'Model Comparison', lambda ctx: model_table_spec(ctx['cube'], ctx['offset']))
+    ]},
+    'trends': {"title": "Trends", "sales": True, "section_heading": "h2", "sections": [
+        ('quarterly', 'Quarter-over-Quarter Trend', lambda ctx: quarter_trend_spec(ctx['cube'])),
+        ('qoq', 'Quarter-over-Quarter % Change', lambda ctx: qoq_table_spec(ctx['cube'])),
+        ('monthly', 'Monthly Trend', lambda ctx: monthly_trend_spec(ctx['cube']))
+    ]},
+    'hr': {"title": "HR Overview", "sales": False, "sections": [
+        ('employees', 'Employee Information & Salary', lambda ctx: hr_table_spec()),
+        ('performance', 'Performance Distribution', lambda ctx: performance_spec()),
+        ('time_log', 'Employee Time Log', lambda ctx: time_log_table_spec()),
+        ('hours', 'Total Logged Hours per Employee', lambda ctx: hours_spec())
+    ]},
+    'inventory': {"title": "Inventory", "sales": False, "sections": [
+        ('parts', 'Inventory', lambda ctx: inventory_table_spec()),
+        ('low_stock', 'Low Stock Alert', lambda ctx: low_stock_spec())
+    ]},
+    'crm': {"title": "CRM", "sales": False, "sections": [
+        ('interactions', 'CRM', lambda ctx: crm_table_spec()),
+        ('satisfaction_time', 'Satisfaction Over Time', lambda ctx: satisfaction_time_spec()),
+        ('satisfaction_type', 'Satisfaction Score by Interaction Type', lambda ctx: satisfaction_type_spec())
+    ]},
+    'demo': {"title": "Demographics", "sales": False, "sections": [
+        ('customers', 'Demographics', lambda ctx: demo_table_spec()),
+        ('age', 'Age Group Distribution', lambda ctx: age_spec()),
+        ('region', 'Purchase Amount by Region', lambda ctx: region_spec())
+    ]}
+}
+VIEWS['trend'] = VIEWS['kpi']
+METRICS = ["sale_price", "commission_earned"]
+
+# Helper function to resolve the filters for an API call: query-string filters win over the session
+def get_request_filters():
+    if any(dim in request.args for dim in FILTER_DIMENSIONS):
+        return parse_filters(request.args)
+    return get_session_filters()
+
+# Helper function to resolve the metric chosen in the filter form
+def get_session_metric():
+    metric = session.get('metric', 'sale_price')
+    return metric if metric in METRICS else 'sale_price'
+
+# Helper function to resolve the metric for an API call: the query string wins over the session
+def get_request_metric():
+    metric = request.args.get('metric')
+    return metric if metric in METRICS else get_session_metric()
+
+# Helper function to build the context view section builders receive
+def view_context(filters, metric):
+    page = max(request.args.get('page', 1, type=int), 1)
+    return {"filters": filters, "metric": metric, "cube": get_filtered_cube(filters), "page": page, "offset": (page - 1) * TABLE_MAX_ROWS}
+
+# Helper function to encode the chart of a section spec for the API payload
+@timed_stage('figure')
+def encode_section(spec):
+    if "chart" in spec:
+        return {"chart": encode_chart(spec["chart"], dedup=True)}
+    return spec
+
+# Helper function to serve one view section from the chart cache, keyed by the view's filters, metric and page
+def cached_view_section(route, view, section_id, render, ctx):
+    spec = VIEWS[view]
+    cache_id = f"{section_id}:{ctx['page']}" if spec.get("paged") else section_id
+    return cached_section(route, cache_id, render, ctx['metric'] if spec.get("metric") else None, spec["sales"], ctx['filters'])
+
+# Helper function to build (or fetch from the chart cache) the JSON of one view section
+def section_json(view, section_id, title, build, ctx):
+    return cached_view_section(
+        f"api:{view}", view, section_id,
+        lambda: pio.json.to_json_plotly({"id": section_id, "title": title, **encode_section(build(ctx))}), ctx
+    )
 
-        car_model_metric = filtered_df.groupby('car_model')['sale_price'].sum().nlargest(10).reset_index()
-        fig = go.Figure(data=go.Pie(
-            labels=car_model_metric['car_model'], values=car_model_metric['sale_price'],
-            marker_colors=['#D3D3D3', '#A9A9A9', '#808080', '#606060', '#4A4A4A', '#3A3A3A', '#2A2A2A', '#1C1C1C']
-        ))
-        fig.update_layout(template='plotly_dark', plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400)
-        model_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-        chart_html = f"""
-            <div style="display: flex; justify-content: space-between;">
-                <div style="flex: 50%; padding: 10px;">
-                    <h3>Car Make</h3>
-                    {make_html}
-                </div>
-                <div style="flex: 50%; padding: 10px;">
-                    <h3>Car Model</h3>
-                    {model_html}
-                </div>
+# Helper function to lay out the server-rendered sections of a view: markup strings plus lazily rendered sections
+def view_sections_html(view, ctx):
+    spec = VIEWS[view]
+    if spec["sales"] and ctx['cube'].empty:
+        return f"<p style='color:white'>No data available for {spec['title']}</p>"
+    tag = spec.get("section_heading", "h3")
+    parts = []
+    for section_id, title, build in spec["sections"]:
+        html = lambda section_id=section_id, build=build: cached_view_section(
+            view, view, section_id, lambda: render_section(build(ctx)), ctx
+        )
+        if spec.get("columns"):
+            parts += [f'<div style="flex: 50%; padding: 10px;"><{tag}>{title}</{tag}>', html, '</div>']
+        else:
+            parts += ([] if title == spec["title"] else [f"<{tag}>{title}</{tag}>"]) + [html]
+    if spec.get("columns"):
+        parts = ['<div style="display: flex; justify-content: space-between;">', *parts, '</div>']
+    return parts
+
+# Client-side rendering: pages fetch /api/v1/<view> and draw the sections with plotly.js in the browser
+CLIENT_RENDERING = os.environ.get('CLIENT_RENDERING', '0') == '1'
+CLIENT_RENDER_SCRIPT = """
+<script>
+    const CHART_LAYOUT = %(layout)s;
+    const TABLE_OPEN = %(table_open)s, TABLE_HEADER_CELL = %(table_header_cell)s, TABLE_CELL = %(table_cell)s;
+
+    function renderTable(table) {
+        const header = table.columns.map(col => {
+            const th = document.createElement('th');
+            th.textContent = col;
+            return TABLE_HEADER_CELL + th.innerHTML + '</th>';
+        }).join('');
+        const rows = table.rows.map(row => '<tr>' + TABLE_CELL + row.join('</td>' + TABLE_CELL) + '</td></tr>').join('');
+        let html = TABLE_OPEN + "<tr style='background-color:#3A3A3A;'>" + header + '</tr>' + rows + '</table>';
+        if (table.offset > 0 || table.offset + table.rows.length < table.total) {
+            html += "<p class='footer'>Showing rows " + (table.offset + 1).toLocaleString('en-US') + '-' +
+                (table.offset + table.rows.length).toLocaleString('en-US') + ' of ' + table.total.toLocaleString('en-US') + '</p>';
+        }
+        return html;
+    }
+
+    function expandCategories(chart) {
+        return chart.data.map(trace => {
+            const expanded = Object.assign({}, trace);
+            Object.keys(trace).forEach(key => {
+                if (trace[key] && trace[key].codes) {
+                    expanded[key] = trace[key].codes.map(code => chart.categories[code]);
+                }
+            });
+            return expanded;
+        });
+    }
+
+    function renderSections(container, payload) {
+        container.innerHTML = '';
+        payload.sections.forEach(section => {
+            const block = document.createElement('div');
+            // As on server-rendered pages, a section titled like its view sits under the page heading alone
+            if (section.title && section.title !== payload.title) {
+                const heading = document.createElement('h3');
+                heading.textContent = section.title;
+                block.appendChild(heading);
+            }
+            container.appendChild(block);
+            if (section.chart) {
+                const plot = document.createElement('div');
+                block.appendChild(plot);
+                Plotly.newPlot(plot, expandCategories(section.chart), Object.assign({}, CHART_LAYOUT, section.chart.layout), {responsive: true});
+            } else if (section.table) {
+                block.insertAdjacentHTML('beforeend', renderTable(section.table));
+            } else {
+                const message = document.createElement('p');
+                message.style.color = 'white';
+                message.textContent = section.message;
+                block.appendChild(message);
+            }
+        });
+    }
+
+    async function loadSections(view, body) {
+        const container = document.getElementById('client-sections');
+        const response = await fetch('/api/v1/' + view + window.location.search, body ? {method: 'POST', body: body} : {});
+        const payload = await response.json();
+        const kpis = payload.kpis;
+        document.querySelectorAll('.kpi-item span').forEach((span, i) => {
+            span.textContent = [kpis.total_sales, kpis.total_commission, kpis.avg_sale_price, kpis.transactions][i];
+        });
+        renderSections(container, payload);
+    }
+
+    const clientView = document.getElementById('client-sections').dataset.view;
+    document.querySelector('.filter-form').addEventListener('submit', event => {
+        event.preventDefault();
+        loadSections(clientView, new FormData(event.target));
+    });
+    loadSections(clientView);
+</script>
+""" % {
+    "layout": pio.json.to_json_plotly({**CHART_LAYOUT, "template": CHART_TEMPLATE}),
+    "table_open": json.dumps(TABLE_OPEN),
+    "table_header_cell": json.dumps(TABLE_HEADER_CELL),
+    "table_cell": json.dumps(TABLE_CELL)
+}
+
+# Helper function to emit the client-rendered sections placeholder for a view
+def client_sections_html(view):
+    return f'<div id="client-sections" data-view="{view}"></div>{CLIENT_RENDER_SCRIPT}'
+
+# Page shell shared by every dashboard route. It is compiled once into static byte segments and named
+# slots; a request only encodes the slot values and joins them with the cached static bytes.
+class PageTemplate:
+    SLOT_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+    def __init__(self, source, **static):
+        # Slots given here are baked into the static segments at compile time
+        self.segments = []
+        self.slots = []
+        static_text = ''
+        position = 0
+        for match in self.SLOT_PATTERN.finditer(source):
+            static_text += source[position:match.start()]
+            position = match.end()
+            name = match.group(1)
+            if name in static:
+                static_text += static[name]
+                continue
+            self.segments.append(static_text.encode('utf-8'))
+            self.slots.append(name)
+            static_text = ''
+        self.segments.append((static_text + source[position:]).encode('utf-8'))
+
+    def iter_render(self, values, flush_markers=False):
+        # Yields the page piece by piece. Slot values may be str, bytes, or a list of those and of callables
+        # returning them; callables only run when the render reaches them, preceded by a None flush marker
+        # when flush_markers is set.
+        for segment, name in zip(self.segments, self.slots):
+            yield segment
+            yield from self.iter_value(values[name], flush_markers)
+        yield self.segments[-1]
+
+    def iter_value(self, value, flush_markers):
+        if isinstance(value, list):
+            for part in value:
+                if callable(part):
+                    if flush_markers:
+                        yield None
+                    part = part()
+                yield from self.iter_value(part, flush_markers)
+        else:
+            yield value if isinstance(value, bytes) else value.encode('utf-8')
+
+    def render(self, values):
+        return b''.join(self.iter_render(values))
+
+    def stream(self, values):
+        # Coalesces the pieces into one chunk per lazy part, so everything before a slow section goes out first
+        buffer = []
+        for piece in self.iter_render(values, flush_markers=True):
+            if piece is None:
+                if buffer:
+                    yield b''.join(buffer)
+                    buffer = []
+            else:
+                buffer.append(piece)
+        yield b''.join(buffer)
+
+PAGE_TITLE = "Automotive Analytics Dashboard"
+PAGE_SHELL = PageTemplate("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <script src="{{plotly_js_url}}" charset="utf-8"></script>
+    <title>{{title}}</title>
+    <style>
+        body { background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }
+        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
+        h1 { display: flex; align-items: center; }
+        h1::before { content: '🚗'; margin-right: 10px; }
+        .filter-form { display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }
+        label { font-weight: bold; margin-bottom: 5px; display: block; }
+        select, button { width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }
+        button:hover { background-color: #3A3A3A; cursor: pointer; }
+        .kpi-section { margin: 20px 0; }
+        .kpi-header { color: #FF0000; font-size: 18px; margin-bottom: 10px; }
+        .kpi-box { display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }
+        .kpi-item { background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }
+        .kpi-item span { display: block; font-size: 24px; font-weight: bold; }
+        .nav { margin: 20px 0; border-bottom: 1px solid #4A4A4A; }
+        .nav a { color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }
+        .nav a:hover { color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }
+        .chart-container { margin: 20px 0; }
+        .download-form { margin-top: 20px; }
+        .footer { color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Automotive Analytics Dashboard</h1>
+        <form class="filter-form" method="POST">
+            <div>
+                <label>Salesperson</label>
+                <select name="salesperson">
+                    {{salesperson_options}}
+                </select>
             </div>
-        """
-
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
-
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Vehicle Sales - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
+            <div>
+                <label>Car Make</label>
+                <select id="car_make" name="car_make" onchange="updateModels()">
+                    {{car_make_options}}
+                </select>
+            </div>
+            <div>
+                <label>Car Year</label>
+                <select name="car_year">
+                    {{car_year_options}}
+                </select>
+            </div>
+            <div>
+                <label>Car Model</label>
+                <select id="car_model" name="car_model">
+                    <option value="All">All</option>
+                </select>
+            </div>
+            <div>
+                <label>Metric</label>
+                <select name="metric">
+                    {{metric_options}}
+                </select>
+            </div>
+            <div>
+                <label> </label>
+                <button type="submit">Apply Filters</button>
+            </div>
+        </form>
+        <div class="kpi-section">
+            <div class="kpi-header">* Key Performance Indicators</div>
+            <div class="kpi-box">
+                <div class="kpi-item">
+                    Total Sales<br>
+                    <span>{{total_sales}}</span>
+                </div>
+                <div class="kpi-item">
+                    Total Commission<br>
+                    <span>{{total_comm}}</span>
                 </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
+                <div class="kpi-item">
+                    Avg Sale Price<br>
+                    <span>{{avg_price}}</span>
                 </div>
-                <div class="chart-container">
-                    <h2>Vehicle Sales</h2>
-                    {chart_html}
+                <div class="kpi-item">
+                    Transactions<br>
+                    <span>{{trans_count}}</span>
                 </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
             </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
+        </div>
+        <div class="nav">
+            <a href="/kpi">KPI Trend</a>
+            <a href="/3d">3D Sales</a>
+            <a href="/heatmap">Heatmap</a>
+            <a href="/top">Top Performers</a>
+            <a href="/vehicle">Vehicle Sales</a>
+            <a href="/model">Model Comparison</a>
+            <a href="/trends">Trends</a>
+            <a href="/hr">HR Overview</a>
+            <a href="/inventory">Inventory</a>
+            <a href="/crm">CRM</a>
+            <a href="/demo">Demographics</a>
+        </div>
+        <div class="chart-container">
+            {{heading}}{{chart_html}}
+        </div>
+        <form class="download-form" method="POST" action="/download_csv">
+            <button type="submit">Download CSV</button>
+        </form>
+        <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
+    </div>
+    <script>
+        const carModels = {{car_models_json}};
+        const selectedModels = {{selected_models_json}};
+
+        function updateModels() {
+            const make = document.getElementById('car_make').value;
+            const modelSelect = document.getElementById('car_model');
+            modelSelect.innerHTML = '<option value="All">All</option>';
+            if (make !== 'All' && carModels[make]) {
+                carModels[make].forEach(model => {
+                    const option = document.createElement('option');
+                    option.value = model;
+                    option.text = model;
+                    if (selectedModels.includes(model)) {
+                        option.selected = true;
+                    }
+                    modelSelect.add(option);
+                });
+            } else {
+                modelSelect.value = selectedModels.length === 1 ? selectedModels[0] : 'All';
+            }
+        }
+        updateModels();
+    </script>
+</body>
+</html>
+""", plotly_js_url=PLOTLY_JS_URL)
+
+# Streamed pages: the shell up to the chart container (head, filter form, KPIs) is flushed before any
+# section is computed, then each section goes out as soon as it is rendered
+STREAM_PAGES = os.environ.get('STREAM_PAGES', '0') == '1'
+
+SECTION_ERROR_HTML = "<p style='color:white'>This section could not be rendered</p>"
+SECTION_TIMEOUT_HTML = "<p style='color:white'>This section took too long to render</p>"
+
+# Helper function to keep one failing section from cutting a streamed page short (the status line is already sent)
+def guard_section(render):
+    def guarded():
+        try:
+            return render()
+        except Exception as e:
+            logging.error(f"Error rendering section: {str(e)}")
+            return SECTION_ERROR_HTML
+    return guarded
+
+# Concurrent sections: with SECTION_WORKERS > 0, a page's lazily rendered sections are built at the same time
+# on a shared thread pool (pandas kernels and the compressors release the GIL for parts of the work) and
+# assembled in page order. A page waits at most SECTION_TIMEOUT seconds for them; a late section is replaced by
+# a placeholder but keeps running, so its fragment still reaches the chart cache for the next request.
+SECTION_WORKERS = int(os.environ.get('SECTION_WORKERS', 0))
+SECTION_TIMEOUT = float(os.environ.get('SECTION_TIMEOUT', 10))
+section_pool = ThreadPoolExecutor(max_workers=SECTION_WORKERS, thread_name_prefix='section') if SECTION_WORKERS > 0 else None
+
+# Helper function to render a section on the pool with the request's context; the stage timings and cache
+# counts it records are handed back for the request thread to merge
+def submit_section(render):
+    dataset_version = g.dataset_version
+    @copy_current_request_context
+    def task():
+        g.dataset_version = dataset_version
+        g.stage_timings, g.stage_stack, g.cache_hits, g.cache_misses = {}, [], 0, 0
+        html = render()
+        return html, g.stage_timings, g.cache_hits, g.cache_misses
+    return section_pool.submit(task)
+
+# Helper function to wait for a submitted section until the page's deadline
+def collect_section(future, deadline):
+    try:
+        html, timings, cache_hits, cache_misses = future.result(timeout=max(deadline - time.monotonic(), 0))
+    except FutureTimeout:
+        logging.warning("Section not rendered within %ss, sending a placeholder", SECTION_TIMEOUT)
+        g.page_degraded = True
+        return SECTION_TIMEOUT_HTML
+    except Exception as e:
+        logging.error(f"Error rendering section: {str(e)}")
+        g.page_degraded = True
+        return SECTION_ERROR_HTML
+    for stage, elapsed in timings.items():
+        g.stage_timings[stage] = g.stage_timings.get(stage, 0.0) + elapsed
+    g.cache_hits += cache_hits
+    g.cache_misses += cache_misses
     return html
 
-@app.route('/model', methods=['GET', 'POST'])
-def model():
+# Helper function to start all sections of a page on the pool; each section becomes a callable that
+# collects its result, so the page shell (buffered or streamed) assembles them in order
+def render_sections_concurrently(parts):
+    deadline = time.monotonic() + SECTION_TIMEOUT
+    parts = [submit_section(part) if callable(part) else part for part in parts]
+    return [functools.partial(collect_section, part, deadline) if isinstance(part, Future) else part for part in parts]
+
+# Helper function to fill the page shell for a route: common filter options, KPIs and the route's chart markup,
+# given as a string or as a list of strings and lazily rendered sections
+@timed_stage('template')
+def render_page(chart_html, kpis, title=None, heading=None):
+    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
+    total_sales, total_comm, avg_price, trans_count = kpis
+    values = {
+        "title": f"{title} - {PAGE_TITLE}" if title else PAGE_TITLE,
+        "salesperson_options": salesperson_options,
+        "car_make_options": car_make_options,
+        "car_year_options": car_year_options,
+        "metric_options": metric_options,
+        "total_sales": total_sales,
+        "total_comm": total_comm,
+        "avg_price": avg_price,
+        "trans_count": trans_count,
+        "heading": f"<h2>{heading}</h2>" if heading else "",
+        "chart_html": chart_html,
+        "car_models_json": car_models_json,
+        "selected_models_json": html_safe_json(get_session_filters()["car_model"])
+    }
+    if section_pool is not None and isinstance(chart_html, list) and sum(map(callable, chart_html)) > 1:
+        chart_html = values["chart_html"] = render_sections_concurrently(chart_html)
+    if not STREAM_PAGES:
+        return PAGE_SHELL.render(values)
+    if isinstance(chart_html, list) and any(map(callable, chart_html)):
+        values["chart_html"] = [guard_section(part) if callable(part) else part for part in chart_html]
+        # Sections are rendered after the headers are sent and may still fail or time out, so no ETag vouches for them
+        g.page_streamed_sections = True
+    return Response(stream_with_context(PAGE_SHELL.stream(values)), mimetype="text/html")
+
+# Conditional GET and compression for dashboard pages and API views
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+COMPRESSIBLE_MIMETYPES = {'text/html', 'application/json'}
+with open(__file__, 'rb') as source:
+    # Anything that changes the markup for the same data and filters has to change the ETag too
+    PAGE_BUILD = hashlib.sha256(source.read() + repr(
+        (PLOTLY_JS_ETAG, CLIENT_RENDERING, CHART_ENCODING, CHART_DECIMALS, TABLE_MAX_ROWS, CHART_PIXEL_WIDTH, SCATTER_POINT_BUDGET)
+    ).encode('utf-8')).hexdigest()[:12]
+
+# Helper function to compute a page's strong ETag from the dataset version and the filter state, before rendering
+def page_etag():
+    state = json.dumps([
+        PAGE_BUILD, g.dataset_version, request.path, sorted(request.args.items(multi=True)),
+        get_session_filters(), session.get('metric')
+    ], sort_keys=True)
+    return hashlib.sha256(state.encode('utf-8')).hexdigest()[:24]
+
+# Decorator answering GET requests whose If-None-Match still matches with a 304, without rendering the page
+def conditional_page(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != 'GET':
+            return view(*args, **kwargs)
+        etag = page_etag()
+        headers = {"Cache-Control": "private, no-cache", "Vary": "Accept-Encoding, Cookie"}
+        encoding = negotiate_encoding(request.accept_encodings)
+        for candidate in (etag, f"{etag}-{encoding}"):
+            if request.if_none_match.contains(candidate):
+                return Response(status=304, headers={**headers, "ETag": f'"{candidate}"'})
+        response = app.make_response(view(*args, **kwargs))
+        response.headers.update(headers)
+        # A page with a placeholder section must not be revalidated as if it were complete; neither can a
+        # streamed page whose sections are only rendered after the headers are sent
+        if not g.get('page_degraded') and not g.get('page_streamed_sections'):
+            response.set_etag(etag)
+        return response
+    return wrapper
+
+# Helper function to compress a response body; dynamic pages trade a little ratio for speed
+@timed_stage('compress')
+def compress_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+# Helper function to compress a streamed body, flushing the compressor after every chunk so each
+# chunk still reaches the browser as soon as it is produced
+def compress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        compress, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    try:
+        for chunk in chunks:
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+@app.after_request
+def compress_response(response):
+    if (response.direct_passthrough or response.status_code != 200
+            or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding == 'identity':
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+@app.route('/api/v1/<view>', methods=['GET', 'POST'])
+@conditional_page
+def api_view(view):
+    if view not in VIEWS:
+        abort(404)
     if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for Model Comparison</p>"
+        store_filter_form()
+    spec = VIEWS[view]
+    filters = get_request_filters()
+    metric = get_request_metric()
+    ctx = view_context(filters, metric)
+    filtered_cube = ctx['cube']
+    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_cube)
+    if spec["sales"] and filtered_cube.empty:
+        sections = [json.dumps({"id": "empty", "message": f"No data available for {spec['title']}"})]
     else:
-        model_comparison = filtered_df.groupby(['car_make', 'car_model']).agg({
-            'sale_price': ['mean', 'sum', 'count'],
-            'commission_earned': 'mean'
-        }).round(2)
-        model_comparison.columns = ['avg_sale_price', 'total_sales', 'transaction_count', 'avg_commission']
-        model_comparison = model_comparison.reset_index()
-        table_html = generate_table_html(
-            model_comparison,
-            ['car_make', 'car_model', 'avg_sale_price', 'total_sales', 'transaction_count'],
-            {
-                'avg_sale_price': lambda x: f"₹{x:,.2f}",
-                'total_sales': lambda x: f"₹{x:,.2f}",
-                'transaction_count': lambda x: str(int(x))
-            }
-        )
-        chart_html = f"<h2>Model Comparison</h2>{table_html}"
+        sections = [section_json(view, section_id, title, build, ctx) for section_id, title, build in spec["sections"]]
+    header = json.dumps({
+        "view": view,
+        "title": spec["title"],
+        "dataset_version": g.dataset_version,
+        "filters": filters,
+        "metric": metric,
+        "kpis": {"total_sales": total_sales, "total_commission": total_comm, "avg_sale_price": avg_price, "transactions": trans_count}
+    })
+    return Response(f'{header[:-1]}, "sections": [{", ".join(sections)}]}}', mimetype="application/json")
+
+@app.route('/api/v1/dimensions')
+@conditional_page
+def api_dimensions():
+    return Response(dashboard.dimensions.json, mimetype="application/json")
+
+# Ingestion is disabled unless a token is configured; callers send it as a bearer token
+INGEST_TOKEN = os.environ.get('INGEST_TOKEN')
+INGEST_MAX_ROWS = int(os.environ.get('INGEST_MAX_ROWS', 100000))
+
+@app.route('/api/v1/sales', methods=['POST'])
+def ingest_sales():
+    if not INGEST_TOKEN:
+        abort(403)
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {INGEST_TOKEN}"):
+        abort(401)
+    try:
+        if request.mimetype == 'text/csv':
+            batch = pd.read_csv(request.stream)
+        else:
+            records = request.get_json()
+            if isinstance(records, dict):
+                records = records.get('sales')
+            if not isinstance(records, list):
+                raise ValueError("Expected a JSON list of sales or an object with a 'sales' list")
+            batch = pd.DataFrame.from_records(records)
+        if len(batch) > INGEST_MAX_ROWS:
+            raise ValueError(f"Batch of {len(batch):,} rows exceeds the {INGEST_MAX_ROWS:,} row limit")
+        if batch.empty:
+            raise ValueError("No sales in batch")
+        batch = prepare_sales_batch(batch, dashboard.df.dtypes)
+    except Exception as e:
+        logging.error(f"Error reading sales batch: {str(e)}")
+        return {"error": str(e)}, 400
+    dashboard.append_sales(batch)
+    return {"appended": len(batch), "rows": len(dashboard.df), "dataset_version": dashboard.version}, 201
+
+@app.route('/api/v1/memory')
+def api_memory():
+    tables = {table: getattr(dashboard, table) for table in SNAPSHOT_TABLES}
+    return {"dataset_version": dashboard.version, "tables": memory_report(tables)}, 200
 
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
+@app.route('/health')
+def health():
+    return {"status": "OK", "dataset_version": dashboard.version, "chart_cache": chart_cache.stats()}, 200
+
+@app.route('/metrics')
+def metrics():
+    return Response(request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Helper function to guard the profiling endpoints: hidden unless profiling is configured, bearer token otherwise
+def require_profile_token():
+    if not PROFILE_TOKEN:
+        abort(404)
+    authorization = request.headers.get('Authorization', '')
+    if not profile_authorized(authorization[7:] if authorization.startswith('Bearer ') else None):
+        abort(401)
+
+@app.route('/debug/profiles', methods=['GET', 'POST'])
+def debug_profiles():
+    require_profile_token()
+    if request.method == 'POST':
+        try:
+            seconds = float(request.args.get('seconds', 30))
+        except ValueError:
+            return {"error": "seconds must be a number"}, 400
+        if not 0 < seconds <= PROFILE_MAX_WINDOW:
+            return {"error": f"seconds must be between 0 and {PROFILE_MAX_WINDOW}"}, 400
+        with _profile_window_lock:
+            if _profile_window["id"] is not None:
+                return {"error": "A sampling window is already running", "profile_id": _profile_window["id"]}, 409
+            profile_id = new_profile_id()
+            _profile_window["threads"] = set()
+            sampler = StackSampler(_profile_window["threads"]).start()
+            _profile_window["id"] = profile_id
+        timer = threading.Timer(seconds, finish_profile_window, (profile_id, sampler))
+        timer.daemon = True
+        timer.start()
+        return {"profile_id": profile_id, "seconds": seconds, "interval": PROFILE_SAMPLE_INTERVAL, "worker": os.getpid()}, 202
+    names = sorted(os.listdir(PROFILE_DIR)) if os.path.isdir(PROFILE_DIR) else []
+    profiles = [{"profile_id": name.split('.')[0], "format": name.split('.')[1]} for name in names if not name.endswith('.tmp')]
+    return {"profiles": profiles, "sampling": _profile_window["id"]}, 200
+
+@app.route('/debug/profiles/<profile_id>')
+def debug_profile(profile_id):
+    require_profile_token()
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        abort(404)
+    folded_path = os.path.join(PROFILE_DIR, f"{profile_id}.folded")
+    pstats_path = os.path.join(PROFILE_DIR, f"{profile_id}.prof")
+    if os.path.exists(folded_path):
+        with open(folded_path) as f:
+            return Response(f.read(), mimetype="text/plain")
+    if not os.path.exists(pstats_path):
+        if profile_id == _profile_window["id"]:
+            return {"status": "sampling", "profile_id": profile_id}, 202
+        abort(404)
+    if request.args.get('format') == 'pstats':
+        with open(pstats_path, 'rb') as f:
+            return Response(f.read(), mimetype="application/octet-stream",
+                            headers={"Content-Disposition": f"attachment;filename={profile_id}.prof"})
+    sort = request.args.get('sort', 'cumulative')
+    limit = request.args.get('limit', '60')
+    if sort not in PROFILE_SORT_KEYS or not limit.isdigit():
+        return {"error": f"sort must be one of {', '.join(sorted(PROFILE_SORT_KEYS))} and limit a number"}, 400
+    output = io.StringIO()
+    pstats.Stats(pstats_path, stream=output).sort_stats(sort).print_stats(int(limit))
+    return Response(output.getvalue(), mimetype="text/plain")
+
+@app.route('/assets/<filename>')
+def plotly_asset(filename):
+    if filename != PLOTLY_JS_FILENAME:
+        abort(404)
+    headers = {
+        "Cache-Control": f"public, max-age={ASSET_MAX_AGE}, immutable",
+        "Vary": "Accept-Encoding"
+    }
+    encoding = negotiate_encoding(request.accept_encodings)
+    etag = f"{PLOTLY_JS_ETAG}-{encoding}"
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={**headers, "ETag": f'"{etag}"'})
+    body = get_plotly_js_variant(encoding)
+    if encoding != 'identity':
+        headers["Content-Encoding"] = encoding
+    response = Response(body, mimetype="application/javascript", headers=headers)
+    response.set_etag(etag)
+    return response
+
+# Helper function to serve the dashboard page of a view: filter form, KPIs and the view's sections from VIEWS
+def render_view_page(view, titled=True):
+    if request.method == 'POST':
+        store_filter_form()
 
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Model Comparison - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+    ctx = view_context(get_session_filters(), get_session_metric())
+    kpis = calculate_kpis(ctx['cube'])
 
-@app.route('/trends', methods=['GET', 'POST'])
-def trends():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    if filtered_df.empty:
-        chart_html = "<p style='color:white'>No data available for Trends</p>"
+    if CLIENT_RENDERING:
+        chart_html = client_sections_html(view)
     else:
-        trend_df = filtered_df.groupby('quarter')[['sale_price', 'commission_earned']].sum().reset_index()
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=trend_df['quarter'], y=trend_df['sale_price'], name='sale_price', line=dict(color='#A9A9A9')))
-        fig.add_trace(go.Scatter(x=trend_df['quarter'], y=trend_df['commission_earned'], name='Commission', line=dict(color='#808080')))
-        fig.update_layout(
-            xaxis_title='Quarter', yaxis_title='Amount (₹)', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        trend_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-        trend_df['sale_price_qoq_percent'] = trend_df['sale_price'].pct_change().fillna(0) * 100
-        trend_df['commission_qoq_percent'] = trend_df['commission_earned'].pct_change().fillna(0) * 100
-        qoq_html = generate_table_html(
-            trend_df,
-            ['quarter', 'sale_price_qoq_percent', 'commission_qoq_percent'],
-            {
-                'sale_price_qoq_percent': lambda x: f"{x:.2f}%",
-                'commission_qoq_percent': lambda x: f"{x:.2f}%"
-            }
-        )
-
-        monthly_trend = filtered_df.groupby('month')[['sale_price', 'commission_earned']].sum().reset_index()
-        fig = make_subplots(rows=1, cols=1)
-        fig.add_trace(go.Bar(x=monthly_trend['month'], y=monthly_trend['sale_price'], name='sale_price', marker_color='#A9A9A9'))
-        fig.add_trace(go.Bar(x=monthly_trend['month'], y=monthly_trend['commission_earned'], name='Commission', marker_color='#808080'))
-        fig.update_layout(
-            xaxis_title='Month', yaxis_title='Amount (₹)', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'),
-            barmode='group', height=400
-        )
-        monthly_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
+        chart_html = view_sections_html(view, ctx)
 
-        chart_html = f"""
-            <h2>Quarter-over-Quarter Trend</h2>
-            {trend_html}
-            <h2>Quarter-over-Quarter % Change</h2>
-            {qoq_html}
-            <h2>Monthly Trend</h2>
-            {monthly_html}
-        """
+    title = VIEWS[view]["title"] if titled else None
+    return render_page(chart_html, kpis, title=title, heading=title)
 
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
+@app.route('/', methods=['GET', 'POST'])
+@conditional_page
+def index():
+    return render_view_page('kpi', titled=False)
 
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Trends - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    <h2>Trends</h2>
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+@app.route('/kpi', methods=['GET', 'POST'])
+@conditional_page
+def kpi():
+    return render_view_page('kpi')
 
-@app.route('/hr', methods=['GET', 'POST'])
-def hr():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
+@app.route('/3d', methods=['GET', 'POST'])
+@conditional_page
+def three_d():
+    return render_view_page('3d')
 
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
+@app.route('/heatmap', methods=['GET', 'POST'])
+@conditional_page
+def heatmap():
+    return render_view_page('heatmap')
 
-    hr_html = generate_table_html(
-        dashboard.hr_data,
-        dashboard.hr_data.columns,
-        {
-            'salary_usd': lambda x: f"₹{x:,.2f}",
-            'join_date': lambda x: x.strftime('%Y-%m-%d')
-        }
-    )
-    if dashboard.hr_data.empty:
-        perf_html = "<p style='color:white'>No data available for Performance</p>"
-        hours_html = "<p style='color:white'>No data available for Hours</p>"
-    else:
-        fig = go.Figure(data=[go.Histogram(x=dashboard.hr_data['performance_score'], nbinsx=5, marker_color='#A9A9A9')])
-        fig.update_layout(
-            xaxis_title='Performance Score', yaxis_title='Count', template='plotly_dark',
-            plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        perf_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
+@app.route('/top', methods=['GET', 'POST'])
+@conditional_page
+def top():
+    return render_view_page('top')
 
-        total_hours = dashboard.time_log_data.groupby('employee_id')['total_hours'].sum().reset_index()
-        fig = go.Figure(data=[go.Bar(x=total_hours['employee_id'], y=total_hours['total_hours'], marker_color='#A9A9A9')])
-        fig.update_layout(
-            xaxis_title='Employee ID', yaxis_title='Total Hours', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        hours_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-    time_log_html = generate_table_html(
-        dashboard.time_log_data,
-        dashboard.time_log_data.columns,
-        {'date': lambda x: x.strftime('%Y-%m-%d')}
-    )
+@app.route('/vehicle', methods=['GET', 'POST'])
+@conditional_page
+def vehicle():
+    return render_view_page('vehicle')
 
-    chart_html = f"""
-        <h2>HR Overview</h2>
-        <h3>Employee Information & Salary</h3>
-        {hr_html}
-        <h3>Performance Distribution</h3>
-        {perf_html}
-        <h3>Employee Time Log</h3>
-        {time_log_html}
-        <h3>Total Logged Hours per Employee</h3>
-        {hours_html}
-    """
+@app.route('/model', methods=['GET', 'POST'])
+@conditional_page
+def model():
+    return render_view_page('model')
 
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
+@app.route('/trends', methods=['GET', 'POST'])
+@conditional_page
+def trends():
+    return render_view_page('trends')
 
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>HR Overview - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+@app.route('/hr', methods=['GET', 'POST'])
+@conditional_page
+def hr():
+    return render_view_page('hr')
 
 @app.route('/inventory', methods=['GET', 'POST'])
+@conditional_page
 def inventory():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    inventory_html = generate_table_html(
-        dashboard.inventory_data,
-        dashboard.inventory_data.columns,
-        {'unit_cost': lambda x: f"₹{x:,.2f}"}
-    )
-    if dashboard.inventory_data.empty:
-        low_stock_html = "<p style='color:white'>No data available for Inventory</p>"
-    else:
-        low_stock = dashboard.inventory_data[dashboard.inventory_data['stock_level'] < dashboard.inventory_data['reorder_level']]
-        if low_stock.empty:
-            low_stock_html = "<p style='color:white'>No low stock items</p>"
-        else:
-            fig = go.Figure(data=[go.Bar(x=low_stock['part_name'], y=low_stock['stock_level'], marker_color='#A9A9A9')])
-            fig.update_layout(
-                xaxis_title='Part Name', yaxis_title='Stock Level', template='plotly_dark',
-                xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-            )
-            low_stock_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-    chart_html = f"""
-        <h2>Inventory</h2>
-        {inventory_html}
-        <h3>Low Stock Alert</h3>
-        {low_stock_html}
-    """
-
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
-
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Inventory - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+    return render_view_page('inventory')
 
 @app.route('/crm', methods=['GET', 'POST'])
+@conditional_page
 def crm():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    crm_html = generate_table_html(
-        dashboard.crm_data,
-        dashboard.crm_data.columns,
-        {'contact_date': lambda x: x.strftime('%Y-%m-%d')}
-    )
-    if dashboard.crm_data.empty:
-        time_html = "<p style='color:white'>No data available for Satisfaction Over Time</p>"
-        type_html = "<p style='color:white'>No data available for Satisfaction by Type</p>"
-    else:
-        line_chart_data = dashboard.crm_data.copy()
-        line_chart_data['contact_date'] = pd.to_datetime(line_chart_data['contact_date'])
-        line_chart_data = line_chart_data.groupby('contact_date')['satisfaction_score'].mean().reset_index()
-        fig = go.Figure(data=[go.Scatter(x=line_chart_data['contact_date'], y=line_chart_data['satisfaction_score'], mode='lines+markers', line=dict(color='#A9A9A9'))])
-        fig.update_layout(
-            xaxis_title='Contact Date', yaxis_title='Satisfaction Score', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        time_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-        interaction_types = dashboard.crm_data['interaction_type'].unique()
-        fig = go.Figure()
-        for itype in interaction_types:
-            fig.add_trace(go.Box(y=dashboard.crm_data[dashboard.crm_data['interaction_type'] == itype]['satisfaction_score'], name=itype))
-        fig.update_layout(
-            xaxis_title='Interaction Type', yaxis_title='Satisfaction Score', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        type_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-    chart_html = f"""
-        <h2>CRM</h2>
-        {crm_html}
-        <h3>Satisfaction Over Time</h3>
-        {time_html}
-        <h3>Satisfaction Score by Interaction Type</h3>
-        {type_html}
-    """
-
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
-
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>CRM - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+    return render_view_page('crm')
 
 @app.route('/demo', methods=['GET', 'POST'])
+@conditional_page
 def demo():
-    if request.method == 'POST':
-        session['salesperson'] = request.form.get('salesperson', 'All')
-        session['car_make'] = request.form.get('car_make', 'All')
-        session['car_model'] = request.form.get('car_model', 'All')
-        session['car_year'] = request.form.get('car_year', 'All')
-        session['metric'] = request.form.get('metric', 'sale_price')
-        logging.info("Filters applied successfully")
-
-    filtered_df = get_filtered_df()
-    total_sales, total_comm, avg_price, trans_count = calculate_kpis(filtered_df)
-
-    demo_html = generate_table_html(
-        dashboard.demo_data,
-        dashboard.demo_data.columns,
-        {'purchase_amount': lambda x: f"₹{x:,.2f}"}
-    )
-    if dashboard.demo_data.empty:
-        age_html = "<p style='color:white'>No data available for Age Distribution</p>"
-        region_html = "<p style='color:white'>No data available for Purchase Amount</p>"
+    return render_view_page('demo')
+
+# Helper function to stream the filtered rows as CSV, optionally gzip-compressed, logging totals when done
+def stream_csv(filtered_view, compress, chunk_rows=CSV_CHUNK_ROWS):
+    started = time.perf_counter()
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    rows_out = raw_bytes = sent_bytes = 0
+    try:
+        if filtered_view.empty:
+            chunks = [filtered_view.df.iloc[0:0]]
+        else:
+            chunks = filtered_view.iter_frames(chunk_rows)
+        for i, chunk in enumerate(chunks):
+            data = chunk.to_csv(index=False, header=(i == 0)).encode('utf-8')
+            rows_out += len(chunk)
+            raw_bytes += len(data)
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                sent_bytes += len(data)
+                yield data
+        if compressor is not None:
+            data = compressor.flush()
+            sent_bytes += len(data)
+            yield data
+    finally:
+        logging.info("CSV export finished", extra={"fields": {
+            "export": "csv", "rows": rows_out, "raw_bytes": raw_bytes, "bytes": sent_bytes,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }})
+
+# Columnar export formats: media type and file extension
+EXPORT_FORMATS = {
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+    'feather': ('application/vnd.apache.arrow.file', 'feather'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet')
+}
+EXPORT_CHUNK_ROWS = int(os.environ.get('EXPORT_CHUNK_ROWS', 100000))
+
+class ChunkSink:
+    # Write-only file object for pyarrow writers; tracks the position and hands back what was written so far
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+# Helper function to stream the filtered rows as Arrow IPC stream, Feather or Parquet, one record batch per chunk
+def stream_columnar(filtered_view, fmt, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    started = time.perf_counter()
+    sink = ChunkSink()
+    # Inferred from the head of the shared frame so the schema does not depend on the selection
+    schema = pa.Schema.from_pandas(filtered_view.df[columns].head(1000), preserve_index=False)
+    if fmt == 'arrow':
+        writer = pa.ipc.new_stream(sink, schema)
+    elif fmt == 'feather':
+        writer = pa.ipc.new_file(sink, schema)
     else:
-        age_counts = dashboard.demo_data['age_group'].value_counts().reset_index()
-        age_counts.columns = ['age_group', 'count']
-        fig = go.Figure(data=[go.Bar(x=age_counts['age_group'], y=age_counts['count'], marker_color='#A9A9A9')])
-        fig.update_layout(
-            xaxis_title='Age Group', yaxis_title='Count', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        age_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-        regions = dashboard.demo_data['region'].unique()
-        fig = go.Figure()
-        for region in regions:
-            fig.add_trace(go.Box(y=dashboard.demo_data[dashboard.demo_data['region'] == region]['purchase_amount'], name=region))
-        fig.update_layout(
-            xaxis_title='Region', yaxis_title='Purchase Amount (₹)', template='plotly_dark',
-            xaxis=dict(tickangle=45), plot_bgcolor='#2A2A2A', paper_bgcolor='#2A2A2A', font=dict(color='#D3D3D3'), height=400
-        )
-        region_html = pio.to_html(fig, full_html=False, include_plotlyjs=True)
-
-    chart_html = f"""
-        <h2>Demographics</h2>
-        {demo_html}
-        <h3>Age Group Distribution</h3>
-        {age_html}
-        <h3>Purchase Amount by Region</h3>
-        {region_html}
-    """
-
-    salesperson_options, car_make_options, car_year_options, metric_options, car_models_json = get_common_html_parts()
-
-    html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Demographics - Automotive Analytics Dashboard</title>
-            <style>
-                body {{ background-color: #1C1C1C; color: #D3D3D3; font-family: Arial, sans-serif; margin: 0; padding: 0; }}
-                .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                h1 {{ display: flex; align-items: center; }}
-                h1::before {{ content: '🚗'; margin-right: 10px; }}
-                .filter-form {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 10px; margin-bottom: 20px; }}
-                label {{ font-weight: bold; margin-bottom: 5px; display: block; }}
-                select, button {{ width: 100%; padding: 10px; background-color: #2A2A2A; color: #D3D3D3; border: 1px solid #4A4A4A; border-radius: 5px; }}
-                button:hover {{ background-color: #3A3A3A; cursor: pointer; }}
-                .kpi-section {{ margin: 20px 0; }}
-                .kpi-header {{ color: #FF0000; font-size: 18px; margin-bottom: 10px; }}
-                .kpi-box {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; }}
-                .kpi-item {{ background-color: #2A2A2A; padding: 15px; border-radius: 5px; border: 1px solid #4A4A4A; text-align: center; }}
-                .kpi-item span {{ display: block; font-size: 24px; font-weight: bold; }}
-                .nav {{ margin: 20px 0; border-bottom: 1px solid #4A4A4A; }}
-                .nav a {{ color: #A9A9A9; margin-right: 15px; text-decoration: none; padding: 10px; display: inline-block; }}
-                .nav a:hover {{ color: #FFFFFF; background-color: #3A3A3A; border-radius: 5px 5px 0 0; }}
-                .chart-container {{ margin: 20px 0; }}
-                .download-form {{ margin-top: 20px; }}
-                .footer {{ color: #A9A9A9; font-size: 12px; text-align: center; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Automotive Analytics Dashboard</h1>
-                <form class="filter-form" method="POST">
-                    <div>
-                        <label>Salesperson</label>
-                        <select name="salesperson">
-                            {salesperson_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Make</label>
-                        <select id="car_make" name="car_make" onchange="updateModels()">
-                            {car_make_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Year</label>
-                        <select name="car_year">
-                            {car_year_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label>Car Model</label>
-                        <select id="car_model" name="car_model">
-                            <option value="All">All</option>
-                        </select>
-                    </div>
-                    <div>
-                        <label>Metric</label>
-                        <select name="metric">
-                            {metric_options}
-                        </select>
-                    </div>
-                    <div>
-                        <label> </label>
-                        <button type="submit">Apply Filters</button>
-                    </div>
-                </form>
-                <div class="kpi-section">
-                    <div class="kpi-header">* Key Performance Indicators</div>
-                    <div class="kpi-box">
-                        <div class="kpi-item">
-                            Total Sales<br>
-                            <span>{total_sales}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Total Commission<br>
-                            <span>{total_comm}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Avg Sale Price<br>
-                            <span>{avg_price}</span>
-                        </div>
-                        <div class="kpi-item">
-                            Transactions<br>
-                            <span>{trans_count}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="nav">
-                    <a href="/kpi">KPI Trend</a>
-                    <a href="/3d">3D Sales</a>
-                    <a href="/heatmap">Heatmap</a>
-                    <a href="/top">Top Performers</a>
-                    <a href="/vehicle">Vehicle Sales</a>
-                    <a href="/model">Model Comparison</a>
-                    <a href="/trends">Trends</a>
-                    <a href="/hr">HR Overview</a>
-                    <a href="/inventory">Inventory</a>
-                    <a href="/crm">CRM</a>
-                    <a href="/demo">Demographics</a>
-                </div>
-                <div class="chart-container">
-                    {chart_html}
-                </div>
-                <form class="download-form" method="POST" action="/download_csv">
-                    <button type="submit">Download CSV</button>
-                </form>
-                <p class="footer">© 2025 One Trust | Crafted for smarter auto-financial decisions</p>
-            </div>
-            <script>
-                const carModels = {car_models_json};
-
-                function updateModels() {{
-                    const make = document.getElementById('car_make').value;
-                    const modelSelect = document.getElementById('car_model');
-                    modelSelect.innerHTML = '<option value="All">All</option>';
-                    if (make !== 'All' && carModels[make]) {{
-                        carModels[make].forEach(model => {{
-                            const option = document.createElement('option');
-                            option.value = model;
-                            option.text = model;
-                            if (model === '{session.get("car_model", "All")}') {{
-                                option.selected = true;
-                            }}
-                            modelSelect.add(option);
-                        }});
-                    }} else {{
-                        modelSelect.value = '{session.get("car_model", "All")}';
-                    }}
-                }}
-                updateModels();
-            </script>
-        </body>
-        </html>
-        """
-    return html
+        writer = pq.ParquetWriter(sink, schema)
+    rows_out = 0
+    try:
+        for chunk in filtered_view.iter_frames(chunk_rows, columns):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows_out += len(chunk)
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    finally:
+        logging.info("%s export finished", fmt, extra={"fields": {
+            "export": fmt, "rows": rows_out, "bytes": sink.position,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }})
+
+# Helper function to parse a start/end query value; sale dates are naive, so zoned values are converted to UTC
+def parse_date_param(value):
+    if not value:
+        return None
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_convert(None) if timestamp.tzinfo is not None else timestamp
+
+@app.route('/download/<fmt>', methods=['GET', 'POST'])
+def download_columnar(fmt):
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    if pa is None:
+        return {"error": "pyarrow is not installed"}, 501
+    columns = [c for value in request.values.getlist('columns') for c in value.split(',') if c]
+    columns = columns or list(dashboard.df.columns)
+    unknown = [c for c in columns if c not in dashboard.df.columns]
+    if unknown:
+        return {"error": f"Unknown columns: {', '.join(unknown)}"}, 400
+    filtered_view = get_filtered_view()
+    try:
+        start = parse_date_param(request.values.get('start'))
+        end = parse_date_param(request.values.get('end'))
+    except ValueError:
+        return {"error": "start and end must be dates (YYYY-MM-DD)"}, 400
+    if start is not None or end is not None:
+        dates = filtered_view.column('date')
+        mask = np.ones(len(filtered_view), dtype=bool)
+        if start is not None:
+            mask &= (dates >= start).to_numpy()
+        if end is not None:
+            mask &= (dates < end + pd.Timedelta(days=1)).to_numpy()
+        filtered_view = filtered_view.where(mask)
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    return Response(
+        stream_columnar(filtered_view, fmt, columns),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment;filename=filtered_data.{extension}",
+            "X-Row-Count": str(len(filtered_view))
+        }
+    )
 
 @app.route('/download_csv', methods=['POST'])
 def download_csv():
-    filtered_df = get_filtered_df()
-    csv = filtered_df.to_csv(index=False)
-    return Response(
-        csv,
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment;filename=filtered_data.csv"}
-    )
+    filtered_view = get_filtered_view()
+    compress = request.accept_encodings.quality('gzip') > 0
+    headers = {
+        "Content-Disposition": "attachment;filename=filtered_data.csv",
+        "X-Row-Count": str(len(filtered_view)),
+        "Vary": "Accept-Encoding"
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return Response(stream_csv(filtered_view, compress), mimetype="text/csv", headers=headers)
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 8000))
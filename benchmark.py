@@ -0,0 +1,254 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import logging
+import platform
+import subprocess
+import importlib
+import tempfile
+from datetime import datetime
+import numpy as np
+
+# Latency benchmark for the dashboard routes. Each scale boots the app in its own process against the
+# synthetic generator (SALES_ROWS rows, fixed DATA_SEED), drives every route through the Flask test client
+# with a mix of filter selections, and reports latency percentiles, throughput, response bytes and peak RSS.
+#
+#   python benchmark.py                                  # all scales, results in benchmark_results.json
+#   python benchmark.py --scales 1000,100000 --requests 50
+#   python benchmark.py --save-baseline                  # store the run as benchmark_baseline.json
+#   python benchmark.py --cold                           # chart cache disabled: every section is rendered
+#
+# The warmup requests go through every filter selection, so a default run measures warm (cached) sections
+# and --cold measures rendering. A run is compared against the baseline file when it exists and was taken
+# in the same mode; the exit status is 1 if any route regressed.
+
+ROUTES = ['/', '/kpi', '/3d', '/heatmap', '/top', '/vehicle', '/model', '/trends', '/hr', '/inventory', '/crm', '/demo', '/download_csv']
+DEFAULT_SCALES = [1000, 100000, 1000000, 10000000]
+FILTER_DIMENSIONS = ['salesperson', 'car_make', 'car_model', 'car_year']
+METRICS = ['sale_price', 'commission_earned']
+ACCEPT_ENCODING = 'gzip, deflate, br'
+
+# Helper function to build a reproducible mix of filter selections from the dataset's distinct values
+def filter_combinations(dimensions, count, seed):
+    rng = random.Random(seed)
+    combinations = [{}]
+    while len(combinations) < count:
+        combo = {}
+        for dim in rng.sample(FILTER_DIMENSIONS, rng.randint(1, 2)):
+            values = [str(value) for value in dimensions.values[dim]]
+            if values:
+                combo[dim] = rng.sample(values, min(len(values), rng.randint(1, 2)))
+        combo['metric'] = [rng.choice(METRICS)]
+        combinations.append(combo)
+    return combinations
+
+# Helper function to store a filter selection in the test client's session, as the filter form would
+def set_session_filters(client, combo):
+    with client.session_transaction() as sess:
+        for dim in FILTER_DIMENSIONS:
+            values = combo.get(dim, ['All'])
+            sess[dim] = values if len(values) > 1 else values[0]
+        sess['metric'] = combo.get('metric', ['sale_price'])[0]
+
+# Helper function to issue one request and time it until the last body byte (streamed pages included)
+def timed_request(client, route, combo, post_form):
+    headers = {'Accept-Encoding': ACCEPT_ENCODING}
+    started = time.perf_counter()
+    if route == '/download_csv':
+        response = client.post(route, headers=headers)
+    elif post_form:
+        response = client.post(route, data=combo, headers=headers)
+    else:
+        response = client.get(route, headers=headers)
+    body = response.get_data()
+    elapsed = time.perf_counter() - started
+    response.close()
+    return elapsed, len(body), response.status_code
+
+# Helper function to summarize the latencies (seconds) and response sizes of one route
+def summarize(latencies, sizes, errors):
+    latencies = np.asarray(latencies)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": int(latencies.size),
+        "errors": errors,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(latencies.mean() * 1000), 3),
+        "throughput_rps": round(float(latencies.size / latencies.sum()), 2),
+        "mean_bytes": int(np.mean(sizes)),
+        "total_bytes": int(np.sum(sizes))
+    }
+
+# Helper function to read the peak resident set size of this process in MiB
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+# Helper function to benchmark one scale inside the current process (run by the worker subprocess)
+def run_scale(rows, requests_per_route, warmup, combinations, seed, cold):
+    os.environ['SALES_ROWS'] = str(rows)
+    os.environ.setdefault('DATA_SEED', str(seed))
+    if cold:
+        os.environ['CHART_CACHE_MAX_BYTES'] = '0'
+    logging.disable(logging.WARNING)
+    started = time.perf_counter()
+    app_module = importlib.import_module('app')
+    startup = time.perf_counter() - started
+    boot_rss = peak_rss_mib()
+
+    client = app_module.app.test_client()
+    combos = filter_combinations(app_module.dashboard.dimensions, combinations, seed)
+    for route in ROUTES:
+        for combo in combos * warmup:
+            set_session_filters(client, combo)
+            timed_request(client, route, combo, post_form=False)
+    cache_before = app_module.chart_cache.stats()
+
+    routes = {}
+    wall_started = time.perf_counter()
+    for route in ROUTES:
+        latencies, sizes, errors = [], [], 0
+        for i in range(requests_per_route):
+            # Alternates applying a selection through the form with re-rendering the stored one
+            combo = combos[i % len(combos)]
+            set_session_filters(client, combo)
+            elapsed, size, status = timed_request(client, route, combo, post_form=i % 2 == 0)
+            latencies.append(elapsed)
+            sizes.append(size)
+            errors += status >= 400
+        routes[route] = summarize(latencies, sizes, errors)
+    wall = time.perf_counter() - wall_started
+    total = sum(route["requests"] for route in routes.values())
+    cache_after = app_module.chart_cache.stats()
+    return {
+        "sales_rows": rows,
+        "startup_s": round(startup, 3),
+        "boot_peak_rss_mib": boot_rss,
+        "peak_rss_mib": peak_rss_mib(),
+        "throughput_rps": round(total / wall, 2),
+        "chart_cache": {key: cache_after[key] - cache_before[key] for key in ['hits', 'misses']},
+        "routes": routes
+    }
+
+# Helper function to run one scale in a fresh interpreter, so startup time and peak RSS are per scale; the
+# worker writes its result to a file because the app logs to stdout
+def run_scale_subprocess(rows, args):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result_path = os.path.join(tmp_dir, 'result.json')
+        command = [
+            sys.executable, os.path.abspath(__file__), '--worker', str(rows), '--result', result_path,
+            '--requests', str(args.requests), '--warmup', str(args.warmup),
+            '--combinations', str(args.combinations), '--seed', str(args.seed)
+        ] + (['--cold'] if args.cold else [])
+        completed = subprocess.run(command, cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+        if completed.returncode != 0 or not os.path.exists(result_path):
+            raise RuntimeError(f"Benchmark at {rows:,} rows failed:\n{(completed.stderr or completed.stdout)[-2000:]}")
+        with open(result_path) as f:
+            return json.load(f)
+
+# Helper function to identify the code being measured
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+# Helper function to compare a run with a baseline; returns the regressed (scale, route, metric) entries
+def compare(results, baseline, threshold, noise_ms):
+    regressions = []
+    baseline_scales = {scale["sales_rows"]: scale for scale in baseline.get("scales", [])}
+    for scale in results["scales"]:
+        previous = baseline_scales.get(scale["sales_rows"])
+        if previous is None:
+            continue
+        for route, stats in scale["routes"].items():
+            old = previous["routes"].get(route)
+            if old is None:
+                continue
+            for metric in ['p50_ms', 'p95_ms']:
+                ratio = stats[metric] / old[metric] if old[metric] else float('inf')
+                stats.setdefault("baseline", {})[metric] = {"value": old[metric], "ratio": round(ratio, 3)}
+                if ratio > 1 + threshold and stats[metric] - old[metric] > noise_ms:
+                    regressions.append((scale["sales_rows"], route, metric, old[metric], stats[metric]))
+    return regressions
+
+# Helper function to print a run as one table per scale
+def print_report(results):
+    for scale in results["scales"]:
+        cache = scale["chart_cache"]
+        print(f"\n{scale['sales_rows']:,} sales rows ({'cold' if results['config']['cold'] else 'warm'}): "
+              f"startup {scale['startup_s']:.2f}s, peak RSS {scale['peak_rss_mib']:.1f} MiB, "
+              f"{scale['throughput_rps']:.1f} req/s overall, chart cache {cache['hits']} hits / {cache['misses']} misses")
+        print(f"  {'route':<14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'bytes':>12}{'vs base':>10}")
+        for route, stats in scale["routes"].items():
+            ratio = stats.get("baseline", {}).get("p50_ms", {}).get("ratio")
+            print(f"  {route:<14}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+                  f"{stats['throughput_rps']:>10.1f}{stats['mean_bytes']:>12,}{(f'{ratio:.2f}x' if ratio else '-'):>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency benchmark for the dashboard routes")
+    parser.add_argument('--scales', default=','.join(str(scale) for scale in DEFAULT_SCALES), help="comma-separated sales row counts")
+    parser.add_argument('--requests', type=int, default=20, help="timed requests per route and scale")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed passes over every filter selection per route before measuring")
+    parser.add_argument('--combinations', type=int, default=8, help="distinct filter selections to cycle through")
+    parser.add_argument('--seed', type=int, default=5)
+    parser.add_argument('--cold', action='store_true', help="disable the chart cache so every request renders its sections")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default='benchmark_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help="also write this run to the baseline file")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown that counts as a regression")
+    parser.add_argument('--noise-ms', type=float, default=1.0, help="absolute slowdown below which a change is ignored")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        result = run_scale(args.worker, args.requests, args.warmup, args.combinations, args.seed, args.cold)
+        with open(args.result, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    results = {
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"requests": args.requests, "warmup": args.warmup, "combinations": args.combinations, "seed": args.seed, "cold": args.cold},
+        "scales": []
+    }
+    for rows in [int(scale) for scale in args.scales.split(',') if scale]:
+        print(f"Benchmarking {rows:,} sales rows...", file=sys.stderr)
+        results["scales"].append(run_scale_subprocess(rows, args))
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config", {}).get("cold", False) == args.cold:
+            regressions = compare(results, baseline, args.threshold, args.noise_ms)
+        else:
+            print(f"Baseline {args.baseline} was taken in the other cache mode, not comparing", file=sys.stderr)
+        results["regressions"] = [
+            {"sales_rows": rows, "route": route, "metric": metric, "baseline": old, "current": new}
+            for rows, route, metric, old, new in regressions
+        ]
+    print_report(results)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    for rows, route, metric, old, new in regressions:
+        print(f"REGRESSION {rows:,} rows {route} {metric}: {old:.2f} -> {new:.2f}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())